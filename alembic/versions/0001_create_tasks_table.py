@@ -0,0 +1,44 @@
+"""Create tasks table
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases bootstrapped with Base.metadata.create_all() (DEBUG mode)
+    # already have the table; adopt it instead of failing.
+    if sa.inspect(op.get_bind()).has_table('tasks'):
+        return
+
+    op.create_table(
+        'tasks',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column(
+            'status',
+            sa.Enum('CREATED', 'IN_PROGRESS', 'COMPLETED', name='taskstatusenum'),
+            nullable=False,
+        ),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('tasks')
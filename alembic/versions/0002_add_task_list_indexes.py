@@ -0,0 +1,39 @@
+"""Add composite indexes for task listing
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 10:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # WHERE status = ? ORDER BY created_at DESC, id DESC
+    op.create_index(
+        'ix_tasks_status_created_at_id',
+        'tasks',
+        ['status', 'created_at', 'id'],
+        if_not_exists=True,
+    )
+    # ORDER BY created_at DESC, id DESC (no status filter)
+    op.create_index(
+        'ix_tasks_created_at_id',
+        'tasks',
+        ['created_at', 'id'],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_created_at_id', table_name='tasks')
+    op.drop_index('ix_tasks_status_created_at_id', table_name='tasks')
@@ -0,0 +1,75 @@
+"""Add trigger-maintained per-status task counters
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Like 0001, adopt databases bootstrapped with Base.metadata.create_all(),
+    # which already have the table, triggers and counters.
+    if not sa.inspect(op.get_bind()).has_table('task_counters'):
+        op.create_table(
+            'task_counters',
+            sa.Column(
+                'status',
+                sa.Enum('CREATED', 'IN_PROGRESS', 'COMPLETED', name='taskstatusenum'),
+                nullable=False,
+            ),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('status'),
+        )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_counters_insert AFTER INSERT ON tasks
+        BEGIN
+            INSERT INTO task_counters (status, count) VALUES (NEW.status, 1)
+            ON CONFLICT (status) DO UPDATE SET count = count + 1;
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_counters_update AFTER UPDATE OF status ON tasks
+        WHEN OLD.status <> NEW.status
+        BEGIN
+            UPDATE task_counters SET count = count - 1 WHERE status = OLD.status;
+            INSERT INTO task_counters (status, count) VALUES (NEW.status, 1)
+            ON CONFLICT (status) DO UPDATE SET count = count + 1;
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_counters_delete AFTER DELETE ON tasks
+        BEGIN
+            UPDATE task_counters SET count = count - 1 WHERE status = OLD.status;
+        END
+        """
+    )
+    op.execute(
+        """
+        INSERT OR IGNORE INTO task_counters (status, count)
+        SELECT status, COUNT(*) FROM tasks GROUP BY status
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS tasks_counters_delete")
+    op.execute("DROP TRIGGER IF EXISTS tasks_counters_update")
+    op.execute("DROP TRIGGER IF EXISTS tasks_counters_insert")
+    op.drop_table('task_counters')
@@ -0,0 +1,102 @@
+"""Add trigger-maintained rollups for task statistics
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases bootstrapped with Base.metadata.create_all() already have
+    # the column, the tables and the triggers; add only what is missing.
+    inspector = sa.inspect(op.get_bind())
+    if 'status_changed_at' not in {column['name'] for column in inspector.get_columns('tasks')}:
+        op.add_column('tasks', sa.Column('status_changed_at', sa.DateTime(), nullable=True))
+        # Best guess for existing rows: the last write may have been the status change
+        op.execute("UPDATE tasks SET status_changed_at = updated_at")
+    if not inspector.has_table('task_daily_stats'):
+        op.create_table(
+            'task_daily_stats',
+            sa.Column('day', sa.Date(), nullable=False),
+            sa.Column('created', sa.Integer(), nullable=False),
+            sa.Column('completed', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('day'),
+        )
+    if not inspector.has_table('task_status_durations'):
+        op.create_table(
+            'task_status_durations',
+            sa.Column(
+                'status',
+                sa.Enum('CREATED', 'IN_PROGRESS', 'COMPLETED', name='taskstatusenum'),
+                nullable=False,
+            ),
+            sa.Column('total_seconds', sa.Float(), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('status'),
+        )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_rollups_insert AFTER INSERT ON tasks
+        BEGIN
+            INSERT INTO task_daily_stats (day, created, completed)
+            VALUES (date(NEW.created_at), 1, NEW.status = 'COMPLETED')
+            ON CONFLICT (day) DO UPDATE SET
+                created = created + 1,
+                completed = completed + excluded.completed;
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_rollups_update AFTER UPDATE OF status ON tasks
+        WHEN OLD.status <> NEW.status
+        BEGIN
+            INSERT INTO task_status_durations (status, total_seconds, count)
+            VALUES (
+                OLD.status,
+                (julianday(NEW.updated_at)
+                 - julianday(COALESCE(OLD.status_changed_at, OLD.created_at))) * 86400,
+                1
+            )
+            ON CONFLICT (status) DO UPDATE SET
+                total_seconds = total_seconds + excluded.total_seconds,
+                count = count + 1;
+            INSERT INTO task_daily_stats (day, created, completed)
+            SELECT date(NEW.updated_at), 0, 1 WHERE NEW.status = 'COMPLETED'
+            ON CONFLICT (day) DO UPDATE SET completed = completed + 1;
+            UPDATE tasks SET status_changed_at = NEW.updated_at WHERE rowid = NEW.rowid;
+        END
+        """
+    )
+    op.execute(
+        """
+        INSERT OR IGNORE INTO task_daily_stats (day, created, completed)
+        SELECT day, SUM(created), SUM(completed) FROM (
+            SELECT date(created_at) AS day, 1 AS created, 0 AS completed FROM tasks
+            UNION ALL
+            SELECT date(updated_at), 0, 1 FROM tasks WHERE status = 'COMPLETED'
+        ) GROUP BY day
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS tasks_rollups_update")
+    op.execute("DROP TRIGGER IF EXISTS tasks_rollups_insert")
+    op.drop_table('task_status_durations')
+    op.drop_table('task_daily_stats')
+    # ALTER TABLE ... DROP COLUMN (SQLite 3.35+) keeps rowids, so the
+    # search index stays valid, unlike a batch table rebuild
+    op.drop_column('tasks', 'status_changed_at')
@@ -0,0 +1,105 @@
+"""API dependencies."""
+
+from typing import Optional, Tuple
+
+from fastapi import Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database.async_storage import AsyncTaskStorage, ThreadpoolTaskStorage
+from app.database.backends import task_storage
+from app.database.connection import (
+    STORAGE_BACKEND,
+    get_async_db,
+    get_async_read_db,
+    get_db,
+    get_read_db,
+)
+from app.database.queries import TASK_FIELDS
+from app.database.storage import TaskStorage
+from app.database.write_batcher import BatchingTaskStorage, write_batcher
+from app.services.task_service import AsyncTaskService
+
+
+def get_sync_task_service(db: Session = Depends(get_db)) -> AsyncTaskService:
+    """Provide a task service over the sync storage.
+    
+    Every storage call made while handling the request reuses the request's
+    session, and therefore one pooled connection, and runs in the threadpool.
+    With WRITE_BATCHING enabled, single-task writes are group-committed.
+    """
+    if write_batcher is not None:
+        return AsyncTaskService(BatchingTaskStorage(TaskStorage(db), write_batcher))
+    return AsyncTaskService(ThreadpoolTaskStorage(TaskStorage(db)))
+
+
+def get_sync_task_reader(db: Session = Depends(get_read_db)) -> AsyncTaskService:
+    """Provide a task service over the sync storage's read-only pool."""
+    return AsyncTaskService(ThreadpoolTaskStorage(TaskStorage(db)))
+
+
+async def get_async_task_service(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncTaskService:
+    """Provide a task service over the aiosqlite storage.
+    
+    Every storage call made while handling the request reuses the request's
+    session and runs on the event loop.
+    """
+    return AsyncTaskService(AsyncTaskStorage(db))
+
+
+async def get_async_task_reader(
+    db: AsyncSession = Depends(get_async_read_db),
+) -> AsyncTaskService:
+    """Provide a task service over the aiosqlite storage's read-only pool."""
+    return AsyncTaskService(AsyncTaskStorage(db))
+
+
+def get_memory_task_service() -> AsyncTaskService:
+    """Provide a task service over the in-memory storage.
+    
+    Every request shares the process-wide storage; its calls run in the
+    threadpool since search, export and bulk updates walk all tasks.
+    """
+    return AsyncTaskService(ThreadpoolTaskStorage(task_storage))
+
+
+def get_memory_task_reader() -> AsyncTaskService:
+    """Provide a task service for reads over the in-memory storage."""
+    return get_memory_task_service()
+
+
+def get_task_fields(
+    fields: Optional[str] = Query(
+        None,
+        description=(
+            "Вернуть только перечисленные через запятую поля задачи "
+            f"({', '.join(TASK_FIELDS)})"
+        )
+    ),
+) -> Optional[Tuple[str, ...]]:
+    """Parse the ?fields= projection into task column names, in schema order."""
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(TASK_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Неизвестные поля: {', '.join(sorted(unknown))}"
+        )
+    return tuple(name for name in TASK_FIELDS if name in requested) or None
+
+
+# The dependencies used by the routes, chosen by STORAGE_BACKEND: writes go
+# through get_task_service, GET handlers through get_task_reader.
+if STORAGE_BACKEND == "async":
+    get_task_service = get_async_task_service
+    get_task_reader = get_async_task_reader
+elif STORAGE_BACKEND == "memory":
+    get_task_service = get_memory_task_service
+    get_task_reader = get_memory_task_reader
+else:
+    get_task_service = get_sync_task_service
+    get_task_reader = get_sync_task_reader
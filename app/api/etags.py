@@ -0,0 +1,59 @@
+"""Entity tags for conditional GET requests."""
+
+import hashlib
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from fastapi import Response, status
+
+from app.models.task import Task
+
+
+def _etag(*parts: str) -> str:
+    digest = hashlib.blake2b("|".join(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def task_etag(task: Task) -> str:
+    """Strong ETag of a task; every write moves its updated_at."""
+    return _etag(str(task.id), task.updated_at.isoformat())
+
+
+def task_list_etag(tasks: List[Task], total: Optional[int]) -> str:
+    """Strong ETag of a list page.
+    
+    Derived from the page itself rather than the process-local write
+    version, so every worker serving the same data agrees on it.
+    """
+    return _etag(str(total), *(f"{task.id}@{task.updated_at.isoformat()}" for task in tasks))
+
+
+def _text(value: Any) -> str:
+    # Cached tasks and raw rows hold the same values in different types
+    return value.value if isinstance(value, Enum) else str(value)
+
+
+def partial_task_etag(row: Dict[str, Any]) -> str:
+    """Strong ETag of a projected task: changes whenever a returned field does."""
+    return _etag(*(_text(value) for value in row.values()))
+
+
+def partial_task_list_etag(rows: List[Dict[str, Any]], total: Optional[int]) -> str:
+    """Strong ETag of a page of projected tasks."""
+    return _etag(str(total), *("@".join(_text(value) for value in row.values()) for row in rows))
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response for a matching conditional GET."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
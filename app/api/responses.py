@@ -0,0 +1,69 @@
+"""Fast JSON rendering for task read endpoints."""
+
+from typing import Any, Dict, List, Optional
+
+from fastapi.responses import ORJSONResponse
+
+from app.models.task import Task
+
+
+def _task_fields(task: Task) -> Dict[str, Any]:
+    # A Task already holds validated values for the TaskResponse fields, and
+    # orjson serializes UUID, datetime and the status string itself; they are
+    # dumped as is instead of being copied into a TaskResponse and validated
+    # again by FastAPI.
+    return {
+        "id": task.id,
+        "title": task.title,
+        "description": task.description,
+        "status": task.status,
+        "created_at": task.created_at,
+        "updated_at": task.updated_at,
+    }
+
+
+def task_response(task: Task, headers: Optional[Dict[str, str]] = None) -> ORJSONResponse:
+    """Render a task with the TaskResponse schema."""
+    return ORJSONResponse(_task_fields(task), headers=headers)
+
+
+def partial_task_response(
+    row: Dict[str, Any],
+    headers: Optional[Dict[str, str]] = None
+) -> ORJSONResponse:
+    """Render a task projected to some fields."""
+    return ORJSONResponse(row, headers=headers)
+
+
+def task_list_response(
+    tasks: List[Task],
+    total: Optional[int],
+    skip: int,
+    limit: int,
+    next_cursor: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> ORJSONResponse:
+    """Render a page of tasks with the TaskListResponse schema."""
+    items = [_task_fields(task) for task in tasks]
+    return partial_task_list_response(items, total, skip, limit, next_cursor, headers)
+
+
+def partial_task_list_response(
+    rows: List[Dict[str, Any]],
+    total: Optional[int],
+    skip: int,
+    limit: int,
+    next_cursor: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> ORJSONResponse:
+    """Render a page of tasks projected to some fields."""
+    return ORJSONResponse(
+        {
+            "tasks": rows,
+            "total": total,
+            "skip": skip,
+            "limit": limit,
+            "next_cursor": next_cursor,
+        },
+        headers=headers
+    )
@@ -1,21 +1,47 @@
 """Task API endpoints."""
 
-from typing import Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
+from app.api.dependencies import get_task_fields, get_task_reader, get_task_service
+from app.api.etags import (
+    etag_matches,
+    not_modified,
+    partial_task_etag,
+    partial_task_list_etag,
+    task_etag,
+    task_list_etag,
+)
+from app.api.responses import (
+    partial_task_list_response,
+    partial_task_response,
+    task_list_response,
+    task_response,
+)
 from app.models.task import TaskStatus
 from app.schemas.task_schemas import (
     TaskCreate,
+    TaskImportResponse,
     TaskListResponse,
     TaskResponse,
+    TaskStatsResponse,
+    TaskStatusBulkUpdate,
+    TaskStatusBulkUpdateResponse,
     TaskUpdate,
 )
-from app.services.task_service import task_service
+from app.services.export import EXPORT_MEDIA_TYPES, ExportFormat
+from app.services.importer import IMPORT_CHUNK_SIZE
+from app.services.pagination import encode_cursor, encode_position
+from app.services.task_service import AsyncTaskService
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+BULK_MAX_ITEMS = 5000
+
 
 @router.post(
     "/",
@@ -24,38 +50,229 @@ router = APIRouter(prefix="/tasks", tags=["tasks"])
     summary="Создать новую задачу",
     description="Создает новую задачу с указанными параметрами.",
 )
-def create_task(task_data: TaskCreate) -> TaskResponse:
+async def create_task(
+    task_data: TaskCreate,
+    service: AsyncTaskService = Depends(get_task_service),
+) -> TaskResponse:
     """Create a new task."""
-    task = task_service.create_task(task_data)
+    task = await service.create_task(task_data)
     return TaskResponse.model_validate(task)
 
 
+@router.post(
+    "/bulk",
+    response_model=List[TaskResponse],
+    status_code=status.HTTP_201_CREATED,
+    summary="Создать несколько задач",
+    description=(
+        f"Создает до {BULK_MAX_ITEMS} задач одной транзакцией. Список проверяется целиком: "
+        "при ошибке в любом элементе ни одна задача не создается."
+    ),
+)
+async def create_tasks(
+    tasks_data: List[TaskCreate] = Body(..., min_length=1, max_length=BULK_MAX_ITEMS),
+    service: AsyncTaskService = Depends(get_task_service),
+) -> List[TaskResponse]:
+    """Create several tasks in a single transaction."""
+    tasks = await service.create_tasks(tasks_data)
+    return [TaskResponse.model_validate(task) for task in tasks]
+
+
+@router.post(
+    "/import",
+    response_model=TaskImportResponse,
+    summary="Импортировать задачи из NDJSON",
+    description=(
+        "Создает задачи из тела запроса в формате NDJSON: одна задача (поля `TaskCreate`) "
+        "на строку. Тело читается потоково, задачи фиксируются порциями по `chunk_size`. "
+        "Некорректные строки пропускаются и перечисляются в ответе с номерами строк."
+    ),
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+        }
+    },
+)
+async def import_tasks(
+    request: Request,
+    chunk_size: int = Query(
+        IMPORT_CHUNK_SIZE,
+        ge=1,
+        le=BULK_MAX_ITEMS,
+        description="Количество задач в одной транзакции"
+    ),
+    service: AsyncTaskService = Depends(get_task_service),
+) -> TaskImportResponse:
+    """Import tasks from an NDJSON request body."""
+    return await service.import_tasks(request.stream(), chunk_size=chunk_size)
+
+
+@router.get(
+    "/search",
+    response_model=TaskListResponse,
+    summary="Полнотекстовый поиск задач",
+    description=(
+        "Ищет задачи по словам в названии и описании (полнотекстовый индекс FTS5). "
+        "Каждое слово запроса ищется как префикс, должны совпасть все слова. "
+        "Результаты упорядочены по релевантности, совпадения в названии важнее."
+    ),
+)
+async def search_tasks(
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=200,
+        description="Поисковый запрос"
+    ),
+    status_filter: Optional[TaskStatus] = Query(
+        None,
+        alias="status",
+        description="Фильтр по статусу задачи"
+    ),
+    skip: int = Query(
+        0,
+        ge=0,
+        description="Количество задач для пропуска"
+    ),
+    limit: int = Query(
+        10,
+        ge=1,
+        le=100,
+        description="Максимальное количество задач для возврата"
+    ),
+    service: AsyncTaskService = Depends(get_task_reader),
+) -> Response:
+    """Search tasks by title and description."""
+    tasks, total = await service.search_tasks(q, status=status_filter, skip=skip, limit=limit)
+    
+    return task_list_response(tasks, total, skip, limit)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Выгрузить задачи",
+    description=(
+        "Потоково выгружает все выбранные задачи (от старых к новым) в формате NDJSON "
+        "или CSV без ограничения на количество строк."
+    ),
+)
+async def export_tasks(
+    export_format: ExportFormat = Query(
+        ExportFormat.NDJSON,
+        alias="format",
+        description="Формат выгрузки"
+    ),
+    status_filter: Optional[TaskStatus] = Query(
+        None,
+        alias="status",
+        description="Фильтр по статусу задачи"
+    ),
+    created_after: Optional[datetime] = Query(
+        None,
+        description="Только задачи, созданные не раньше этого момента"
+    ),
+    created_before: Optional[datetime] = Query(
+        None,
+        description="Только задачи, созданные раньше этого момента"
+    ),
+    service: AsyncTaskService = Depends(get_task_reader),
+) -> StreamingResponse:
+    """Stream tasks as NDJSON or CSV."""
+    chunks = service.export_tasks(
+        export_format,
+        status=status_filter,
+        created_after=created_after,
+        created_before=created_before
+    )
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="tasks.{export_format.value}"'
+        }
+    )
+
+
+@router.get(
+    "/stats",
+    response_model=TaskStatsResponse,
+    summary="Получить статистику задач",
+    description=(
+        "Возвращает количество задач по статусам, число созданных и завершенных задач "
+        "по дням и среднее время пребывания в каждом статусе. Данные берутся из "
+        "агрегатов, которые обновляются триггерами при каждой записи."
+    ),
+)
+async def get_stats(
+    days: int = Query(
+        30,
+        ge=1,
+        le=366,
+        description="За сколько последних дней вернуть статистику по дням"
+    ),
+    service: AsyncTaskService = Depends(get_task_reader),
+) -> TaskStatsResponse:
+    """Get aggregated task statistics."""
+    return await service.get_stats(days)
+
+
 @router.get(
     "/{task_id}",
     response_model=TaskResponse,
     summary="Получить задачу по ID",
-    description="Возвращает задачу по указанному идентификатору.",
+    description=(
+        "Возвращает задачу по указанному идентификатору. С параметром `fields` "
+        "читаются и возвращаются только перечисленные поля. Ответ содержит заголовок "
+        "`ETag`; если он совпадает с `If-None-Match`, возвращается 304 без тела."
+    ),
 )
-def get_task(task_id: UUID) -> TaskResponse:
+async def get_task(
+    task_id: UUID,
+    fields: Optional[Tuple[str, ...]] = Depends(get_task_fields),
+    if_none_match: Optional[str] = Header(None),
+    service: AsyncTaskService = Depends(get_task_reader),
+) -> Response:
     """Get task by ID."""
-    task = task_service.get_task(task_id)
+    if fields:
+        task = await service.get_partial_task(task_id, fields)
+    else:
+        task = await service.get_task(task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Задача с ID {task_id} не найдена"
         )
-    return TaskResponse.model_validate(task)
+    
+    if fields:
+        etag = partial_task_etag(task)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        return partial_task_response(task, headers={"ETag": etag})
+    
+    etag = task_etag(task)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return task_response(task, headers={"ETag": etag})
 
 
 @router.get(
     "/",
     response_model=TaskListResponse,
     summary="Получить список задач",
-    description="Возвращает список задач с возможностью фильтрации по статусу и пагинацией.",
+    description=(
+        "Возвращает список задач с возможностью фильтрации по статусу и пагинацией. "
+        "Для глубокой пагинации передавайте `next_cursor` из предыдущего ответа "
+        "в параметре `cursor`. С параметром `fields` читаются и возвращаются только "
+        "перечисленные поля задач. Ответ содержит заголовок `ETag`; если он совпадает "
+        "с `If-None-Match`, возвращается 304 без тела."
+    ),
 )
-def get_tasks(
-    status: Optional[TaskStatus] = Query(
+async def get_tasks(
+    status_filter: Optional[TaskStatus] = Query(
         None,
+        alias="status",
         description="Фильтр по статусу задачи"
     ),
     skip: int = Query(
@@ -69,17 +286,85 @@ def get_tasks(
         le=100,
         description="Максимальное количество задач для возврата"
     ),
-) -> TaskListResponse:
+    cursor: Optional[str] = Query(
+        None,
+        description="Курсор следующей страницы (значение `next_cursor` из предыдущего ответа)"
+    ),
+    include_total: bool = Query(
+        True,
+        description="Возвращать ли общее количество задач (`total`)"
+    ),
+    fields: Optional[Tuple[str, ...]] = Depends(get_task_fields),
+    if_none_match: Optional[str] = Header(None),
+    service: AsyncTaskService = Depends(get_task_reader),
+) -> Response:
     """Get list of tasks with optional filtering and pagination."""
-    tasks, total = task_service.get_tasks(status=status, skip=skip, limit=limit)
+    try:
+        if fields:
+            rows, total = await service.get_partial_tasks(
+                fields,
+                status=status_filter,
+                skip=skip,
+                limit=limit,
+                cursor=cursor,
+                include_total=include_total
+            )
+        else:
+            tasks, total = await service.get_tasks(
+                status=status_filter,
+                skip=skip,
+                limit=limit,
+                cursor=cursor,
+                include_total=include_total
+            )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Некорректный курсор"
+        )
     
-    task_responses = [TaskResponse.model_validate(task) for task in tasks]
+    if fields:
+        return _partial_task_list(rows, fields, total, skip, limit, if_none_match)
     
-    return TaskListResponse(
-        tasks=task_responses,
-        total=total,
-        skip=skip,
-        limit=limit
+    etag = task_list_etag(tasks, total)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    return task_list_response(
+        tasks,
+        total,
+        skip,
+        limit,
+        next_cursor=encode_cursor(tasks[-1]) if len(tasks) == limit else None,
+        headers={"ETag": etag}
+    )
+
+
+def _partial_task_list(
+    rows: List[Dict[str, Any]],
+    fields: Tuple[str, ...],
+    total: Optional[int],
+    skip: int,
+    limit: int,
+    if_none_match: Optional[str]
+) -> Response:
+    """Render a page of projected tasks, dropping the cursor-only columns."""
+    next_cursor = None
+    if len(rows) == limit:
+        next_cursor = encode_position(rows[-1]["created_at"], rows[-1]["id"])
+    if rows and len(rows[0]) > len(fields):
+        rows = [{name: row[name] for name in fields} for row in rows]
+    
+    etag = partial_task_list_etag(rows, total)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return partial_task_list_response(
+        rows,
+        total,
+        skip,
+        limit,
+        next_cursor=next_cursor,
+        headers={"ETag": etag}
     )
 
 
@@ -89,9 +374,13 @@ def get_tasks(
     summary="Обновить задачу",
     description="Обновляет существующую задачу по указанному идентификатору.",
 )
-def update_task(task_id: UUID, task_data: TaskUpdate) -> TaskResponse:
+async def update_task(
+    task_id: UUID,
+    task_data: TaskUpdate,
+    service: AsyncTaskService = Depends(get_task_service),
+) -> TaskResponse:
     """Update an existing task."""
-    updated_task = task_service.update_task(task_id, task_data)
+    updated_task = await service.update_task(task_id, task_data)
     if not updated_task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -100,15 +389,36 @@ def update_task(task_id: UUID, task_data: TaskUpdate) -> TaskResponse:
     return TaskResponse.model_validate(updated_task)
 
 
+@router.patch(
+    "/status",
+    response_model=TaskStatusBulkUpdateResponse,
+    summary="Изменить статус нескольких задач",
+    description=(
+        "Переводит выбранные задачи в новый статус одним запросом к базе данных. "
+        "Задачи выбираются по списку ID и/или по текущему статусу и дате создания."
+    ),
+)
+async def update_tasks_status(
+    update_data: TaskStatusBulkUpdate,
+    service: AsyncTaskService = Depends(get_task_service),
+) -> TaskStatusBulkUpdateResponse:
+    """Move many tasks to a new status at once."""
+    updated = await service.update_tasks_status(update_data)
+    return TaskStatusBulkUpdateResponse(updated=updated)
+
+
 @router.delete(
     "/{task_id}",
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Удалить задачу",
     description="Удаляет задачу по указанному идентификатору.",
 )
-def delete_task(task_id: UUID) -> None:
+async def delete_task(
+    task_id: UUID,
+    service: AsyncTaskService = Depends(get_task_service),
+) -> None:
     """Delete a task."""
-    if not task_service.delete_task(task_id):
+    if not await service.delete_task(task_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Задача с ID {task_id} не найдена"
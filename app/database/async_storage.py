@@ -0,0 +1,220 @@
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+from app.database import queries
+from app.database.base import BaseTaskStorage
+from app.database.connection import AsyncSessionLocal
+from app.database.storage import STREAM_BATCH_SIZE
+from app.database.version import tasks_version
+from app.models.task import Task, TaskStatus
+
+
+class AsyncTaskStorage:
+    """SQLite task storage on SQLAlchemy's asyncio extension (aiosqlite).
+    
+    Mirrors ``TaskStorage`` method for method, running the same statements
+    from ``app.database.queries`` without blocking the event loop.
+    """
+    
+    def __init__(self, db: Optional[AsyncSession] = None, autocommit: bool = True) -> None:
+        self.db = db
+        self.autocommit = autocommit
+    
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[AsyncSession]:
+        if self.db is not None:
+            yield self.db
+            return
+        async with AsyncSessionLocal() as db:
+            yield db
+    
+    async def _commit(self, db: AsyncSession) -> None:
+        if self.autocommit:
+            await db.commit()
+            tasks_version.bump()
+        else:
+            await db.flush()
+    
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["AsyncTaskStorage"]:
+        """Yield a storage whose writes are committed once, on exit.
+        
+        Everything done through the yielded storage is rolled back if the
+        block raises.
+        """
+        async with self._session() as db:
+            try:
+                yield AsyncTaskStorage(db, autocommit=False)
+                await db.commit()
+                tasks_version.bump()
+            except Exception:
+                await db.rollback()
+                raise
+    
+    async def create_task(self, task: Task) -> Task:
+        async with self._session() as db:
+            row = queries.task_to_row(task)
+            await db.execute(queries.insert_tasks(), [row])
+            await self._commit(db)
+            return queries.row_to_task(row)
+    
+    async def create_tasks(self, tasks: List[Task]) -> List[Task]:
+        async with self._session() as db:
+            rows = [queries.task_to_row(task) for task in tasks]
+            await db.execute(queries.insert_tasks(), rows)
+            await self._commit(db)
+            return [queries.row_to_task(row) for row in rows]
+    
+    async def get_task(self, task_id: UUID) -> Optional[Task]:
+        async with self._session() as db:
+            row = (await db.execute(queries.select_task(task_id))).mappings().first()
+            if row:
+                return queries.row_to_task(row)
+            return None
+    
+    async def get_tasks(
+        self,
+        status: Optional[TaskStatus] = None,
+        skip: int = 0,
+        limit: int = 10,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        include_total: bool = True
+    ) -> tuple[List[Task], Optional[int]]:
+        async with self._session() as db:
+            total = None
+            if include_total:
+                total = (await db.execute(queries.count_tasks(status))).scalar_one()
+            
+            result = await db.execute(queries.select_page(status, skip, limit, after))
+            
+            return [queries.row_to_task(row) for row in result.mappings()], total
+    
+    async def get_task_row(self, task_id: UUID, fields: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """Read only the given columns of a task."""
+        async with self._session() as db:
+            row = (await db.execute(queries.select_task(task_id, fields))).mappings().first()
+            return dict(row) if row else None
+    
+    async def get_task_rows(
+        self,
+        fields: Sequence[str],
+        status: Optional[TaskStatus] = None,
+        skip: int = 0,
+        limit: int = 10,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        include_total: bool = True
+    ) -> tuple[List[Dict[str, Any]], Optional[int]]:
+        """Read a page of the task list with only the given columns."""
+        async with self._session() as db:
+            total = None
+            if include_total:
+                total = (await db.execute(queries.count_tasks(status))).scalar_one()
+            result = await db.execute(queries.select_page(status, skip, limit, after, fields))
+            
+            return [dict(row) for row in result.mappings()], total
+    
+    async def search_tasks(
+        self,
+        query: str,
+        status: Optional[TaskStatus] = None,
+        skip: int = 0,
+        limit: int = 10
+    ) -> tuple[List[Task], int]:
+        match = queries.match_query(query)
+        if match is None:
+            return [], 0
+        async with self._session() as db:
+            total = (await db.execute(queries.count_search_tasks(match, status))).scalar_one()
+            stmt = queries.search_tasks(match, status).offset(skip).limit(limit)
+            result = await db.execute(stmt)
+            
+            return [queries.row_to_task(row) for row in result.mappings()], total
+    
+    async def export_tasks(
+        self,
+        status: Optional[TaskStatus] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Stream raw task rows in batches rather than all at once."""
+        async with self._session() as db:
+            stmt = queries.export_tasks(status, created_after, created_before)
+            result = await db.stream(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+            async for batch in result.partitions():
+                yield batch
+    
+    async def update_task(self, task_id: UUID, changes: Dict[str, Any]) -> Optional[Task]:
+        async with self._session() as db:
+            row = (await db.execute(queries.update_task(task_id, changes))).mappings().first()
+            await self._commit(db)
+            return queries.row_to_task(row) if row else None
+    
+    async def update_tasks_status(
+        self,
+        status: TaskStatus,
+        ids: Optional[List[UUID]] = None,
+        current_status: Optional[TaskStatus] = None,
+        created_before: Optional[datetime] = None
+    ) -> int:
+        async with self._session() as db:
+            result = await db.execute(
+                queries.update_tasks_status(status, ids, current_status, created_before)
+            )
+            await self._commit(db)
+            return result.rowcount
+    
+    async def delete_task(self, task_id: UUID) -> bool:
+        async with self._session() as db:
+            result = await db.execute(queries.delete_task(task_id))
+            await self._commit(db)
+            return result.rowcount > 0
+    
+    async def get_stats(self, since: date) -> Dict[str, Any]:
+        """Read the rollups: per-status counts, days since a date, time in status."""
+        async with self._session() as db:
+            counts = await db.execute(queries.select_status_counts())
+            daily = await db.execute(queries.select_daily_stats(since))
+            durations = await db.execute(queries.select_status_durations())
+            return {
+                "by_status": {TaskStatus(status): count for status, count in counts},
+                "daily": daily.all(),
+                "durations": {
+                    TaskStatus(status): (total_seconds, count)
+                    for status, total_seconds, count in durations
+                },
+            }
+    
+    async def count(self) -> int:
+        async with self._session() as db:
+            return (await db.execute(queries.count_tasks())).scalar_one()
+
+
+class ThreadpoolTaskStorage:
+    """Async facade over a sync storage (``TaskStorage`` or the memory one).
+    
+    Every method of the wrapped storage becomes a coroutine that runs the
+    blocking call in Starlette's threadpool, so async handlers can use the
+    sync backend without stalling the event loop.
+    """
+    
+    def __init__(self, storage: BaseTaskStorage) -> None:
+        self.storage = storage
+    
+    def __getattr__(self, name: str) -> Any:
+        method = getattr(self.storage, name)
+        
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await run_in_threadpool(method, *args, **kwargs)
+        
+        return call
+    
+    def export_tasks(self, *args: Any, **kwargs: Any) -> AsyncIterator[Sequence[Row]]:
+        # A generator, not a call: the storage yields whole batches, so
+        # each threadpool call fetches one batch of rows
+        return iterate_in_threadpool(self.storage.export_tasks(*args, **kwargs))
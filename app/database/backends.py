@@ -0,0 +1,26 @@
+"""Selection of the task storage backend."""
+
+import os
+
+from app.database.base import BaseTaskStorage
+from app.database.connection import STORAGE_BACKEND
+from app.database.memory_storage import InMemoryTaskStorage
+from app.database.storage import TaskStorage
+
+# JSON file the memory backend loads on start and saves on shutdown; empty
+# keeps the tasks in memory only.
+MEMORY_SNAPSHOT_PATH = os.getenv("MEMORY_SNAPSHOT_PATH", "")
+
+
+def create_task_storage(backend: str = STORAGE_BACKEND) -> BaseTaskStorage:
+    """Build the storage used when no request-bound one is given.
+    
+    The SQLite backends (sync and async) share ``TaskStorage``, which opens
+    a session per call; ``memory`` keeps every task in this process.
+    """
+    if backend == "memory":
+        return InMemoryTaskStorage(MEMORY_SNAPSHOT_PATH or None)
+    return TaskStorage()
+
+
+task_storage = create_task_storage()
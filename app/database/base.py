@@ -0,0 +1,109 @@
+"""Task storage interface."""
+
+from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from app.models.task import Task, TaskStatus
+
+
+class BaseTaskStorage(ABC):
+    """Operations every task storage backend provides.
+    
+    The services, the async facades and the write batcher only rely on
+    these methods, so backends can be swapped behind the same API.
+    Committed writes must bump ``tasks_version`` for the caches.
+    """
+    
+    @abstractmethod
+    def transaction(self) -> AbstractContextManager["BaseTaskStorage"]:
+        """Yield a storage whose writes are committed together on exit."""
+    
+    @abstractmethod
+    def create_task(self, task: Task) -> Task:
+        ...
+    
+    @abstractmethod
+    def create_tasks(self, tasks: List[Task]) -> List[Task]:
+        ...
+    
+    @abstractmethod
+    def get_task(self, task_id: UUID) -> Optional[Task]:
+        ...
+    
+    @abstractmethod
+    def get_tasks(
+        self,
+        status: Optional[TaskStatus] = None,
+        skip: int = 0,
+        limit: int = 10,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        include_total: bool = True
+    ) -> Tuple[List[Task], Optional[int]]:
+        """Read a page of tasks, newest first, after a (created_at, id) position."""
+    
+    @abstractmethod
+    def get_task_row(self, task_id: UUID, fields: Sequence[str]) -> Optional[Dict[str, Any]]:
+        ...
+    
+    @abstractmethod
+    def get_task_rows(
+        self,
+        fields: Sequence[str],
+        status: Optional[TaskStatus] = None,
+        skip: int = 0,
+        limit: int = 10,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        include_total: bool = True
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        ...
+    
+    @abstractmethod
+    def search_tasks(
+        self,
+        query: str,
+        status: Optional[TaskStatus] = None,
+        skip: int = 0,
+        limit: int = 10
+    ) -> Tuple[List[Task], int]:
+        ...
+    
+    @abstractmethod
+    def export_tasks(
+        self,
+        status: Optional[TaskStatus] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None
+    ) -> Iterator[Sequence[Sequence[Any]]]:
+        """Yield batches of (id, title, description, status, created_at, updated_at), oldest first."""
+    
+    @abstractmethod
+    def update_task(self, task_id: UUID, changes: Dict[str, Any]) -> Optional[Task]:
+        ...
+    
+    @abstractmethod
+    def update_tasks_status(
+        self,
+        status: TaskStatus,
+        ids: Optional[List[UUID]] = None,
+        current_status: Optional[TaskStatus] = None,
+        created_before: Optional[datetime] = None
+    ) -> int:
+        ...
+    
+    @abstractmethod
+    def delete_task(self, task_id: UUID) -> bool:
+        ...
+    
+    @abstractmethod
+    def get_stats(self, since: date) -> Dict[str, Any]:
+        """Return {"by_status": ..., "daily": [(day, created, completed)], "durations": ...}."""
+    
+    @abstractmethod
+    def count(self) -> int:
+        ...
+    
+    def close(self) -> None:
+        """Release the backend's resources on shutdown."""
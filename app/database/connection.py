@@ -1,28 +1,106 @@
 import os
-from sqlalchemy import create_engine
+from functools import partial
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 
+from app.database.slow_queries import SLOW_QUERY_MS, log_slow_queries
+
 load_dotenv()
 
 DB_NAME = os.getenv("DB_NAME", "task_manager.db")
 
+# "sync" runs storage calls in the threadpool, "async" uses aiosqlite
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "sync").lower()
+if STORAGE_BACKEND not in ("sync", "async", "memory"):
+    raise ValueError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
+
+# Applied to every new connection. WAL lets readers run alongside the single
+# writer, and synchronous=NORMAL only fsyncs the WAL at checkpoints. An empty
+# value leaves SQLite's default in place.
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-65536"),
+    "mmap_size": os.getenv("SQLITE_MMAP_SIZE", "268435456"),
+    "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT", "5000"),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+}
+
+DEBUG = os.getenv("DEBUG", "False").lower() == "true"
+
 def get_database_url() -> str:
     return f"sqlite:///./{DB_NAME}"
 
+def get_async_database_url() -> str:
+    return f"sqlite+aiosqlite:///./{DB_NAME}"
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record, read_only: bool = False) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            if value:
+                cursor.execute(f"PRAGMA {name}={value}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+    finally:
+        cursor.close()
+
 engine = create_engine(
     get_database_url(),
-    echo=os.getenv("DEBUG", "False").lower() == "true",
+    echo=DEBUG,
     connect_args={"check_same_thread": False}
 )
 
+# Separate pool for GET handlers: reads never queue behind write sessions
+# for a connection, and query_only guards against accidental writes.
+read_engine = create_engine(
+    get_database_url(),
+    echo=DEBUG,
+    connect_args={"check_same_thread": False}
+)
+
+async_engine = create_async_engine(get_async_database_url(), echo=DEBUG)
+
+async_read_engine = create_async_engine(get_async_database_url(), echo=DEBUG)
+
+event.listen(engine, "connect", apply_sqlite_pragmas)
+event.listen(read_engine, "connect", partial(apply_sqlite_pragmas, read_only=True))
+event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+event.listen(async_read_engine.sync_engine, "connect", partial(apply_sqlite_pragmas, read_only=True))
+
+if SLOW_QUERY_MS > 0:
+    for _engine in (engine, read_engine, async_engine.sync_engine, async_read_engine.sync_engine):
+        log_slow_queries(_engine)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 Base = declarative_base()
 
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
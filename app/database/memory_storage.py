@@ -0,0 +1,418 @@
+"""In-memory task storage.
+
+Tasks live in a dict keyed by id. The list order is kept in sorted
+(created_at, id) keys, one list over all tasks and one per status, so pages,
+cursors and counts are bisect lookups rather than scans. The rollups the
+SQLite triggers maintain are updated alongside every write.
+
+Nothing touches disk unless a snapshot path is given: the state is then
+loaded from it on start and written back by ``save_snapshot()``, which the
+application calls on shutdown.
+"""
+
+import os
+import re
+import threading
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import orjson
+
+from app.database.base import BaseTaskStorage
+from app.database.storage import STREAM_BATCH_SIZE
+from app.database.version import tasks_version
+from app.models.task import Task, TaskStatus
+
+# (created_at, id as stored by SQLite, id): orders like the list indexes,
+# and a (created_at, id) cursor bisects to the key it names.
+_Key = Tuple[datetime, str, UUID]
+
+_WORD = re.compile(r"\w+")
+
+# Same weights as the bm25 ranking of the SQLite search: title, description
+_SEARCH_WEIGHTS = (10, 1)
+
+
+def _key(task: Task) -> _Key:
+    return task.created_at, str(task.id), task.id
+
+
+def _discard(index: List[_Key], key: _Key) -> None:
+    del index[bisect_left(index, key)]
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(text.casefold())
+
+
+def _hits(words: List[str], term: str) -> int:
+    return sum(1 for word in words if word.startswith(term))
+
+
+def _row(task: Task, fields: Sequence[str]) -> Dict[str, Any]:
+    # Shaped like a SQLite row: the id as its string column value
+    return {name: str(task.id) if name == "id" else getattr(task, name) for name in fields}
+
+
+class InMemoryTaskStorage(BaseTaskStorage):
+    """Task storage kept in process memory.
+    
+    Thread-safe: every call holds one lock, so the threadpool facade can
+    share a single instance between requests. ``transaction()`` holds it
+    for the whole block and undoes the block's writes if it raises.
+    """
+    
+    def __init__(self, snapshot_path: Optional[str] = None) -> None:
+        self.snapshot_path = snapshot_path
+        self._lock = threading.RLock()
+        self._journal: Optional[List[Tuple[UUID, Optional[Task], Optional[datetime]]]] = None
+        self._reset()
+        if snapshot_path and os.path.exists(snapshot_path):
+            self.load_snapshot()
+    
+    def _reset(self) -> None:
+        self._tasks: Dict[UUID, Task] = {}
+        self._status_changed_at: Dict[UUID, datetime] = {}
+        self._order: List[_Key] = []
+        self._by_status: Dict[str, List[_Key]] = {status.value: [] for status in TaskStatus}
+        self._daily: Dict[date, List[int]] = {}
+        self._durations: Dict[str, List[float]] = {}
+    
+    def clear(self) -> None:
+        """Drop every task and rollup."""
+        with self._lock:
+            self._reset()
+            tasks_version.bump()
+    
+    def _set(
+        self,
+        task_id: UUID,
+        task: Optional[Task],
+        status_changed_at: Optional[datetime]
+    ) -> None:
+        """Replace a task (None removes it) and move its index keys."""
+        old = self._tasks.get(task_id)
+        if old is not None:
+            key = _key(old)
+            if task is None:
+                _discard(self._order, key)
+            if task is None or task.status != old.status:
+                _discard(self._by_status[old.status], key)
+        if task is None:
+            self._tasks.pop(task_id, None)
+            self._status_changed_at.pop(task_id, None)
+            return
+        key = _key(task)
+        if old is None:
+            insort(self._order, key)
+        if old is None or task.status != old.status:
+            insort(self._by_status[task.status], key)
+        self._tasks[task_id] = task
+        self._status_changed_at[task_id] = status_changed_at
+    
+    def _write(
+        self,
+        task_id: UUID,
+        task: Optional[Task],
+        status_changed_at: Optional[datetime] = None
+    ) -> None:
+        if self._journal is not None:
+            self._journal.append(
+                (task_id, self._tasks.get(task_id), self._status_changed_at.get(task_id))
+            )
+        self._set(task_id, task, status_changed_at)
+    
+    def _commit(self) -> None:
+        if self._journal is None:
+            tasks_version.bump()
+    
+    @contextmanager
+    def transaction(self) -> Iterator["InMemoryTaskStorage"]:
+        """Yield this storage with its writes committed once, on exit.
+        
+        Other threads wait for the block; if it raises, its writes and
+        rollup changes are undone.
+        """
+        with self._lock:
+            if self._journal is not None:
+                # Already inside a transaction: its commit covers this block
+                yield self
+                return
+            daily = {day: list(counts) for day, counts in self._daily.items()}
+            durations = {status: list(totals) for status, totals in self._durations.items()}
+            self._journal = []
+            try:
+                yield self
+            except Exception:
+                for task_id, task, status_changed_at in reversed(self._journal):
+                    self._set(task_id, task, status_changed_at)
+                self._daily, self._durations = daily, durations
+                raise
+            finally:
+                self._journal = None
+            tasks_version.bump()
+    
+    def _insert(self, task: Task) -> Task:
+        # Defaults skip validation: a default status is still the enum member
+        task = task.model_copy(update={
+            "status": TaskStatus(task.status).value,
+            "created_at": task.created_at.replace(tzinfo=None),
+            "updated_at": task.updated_at.replace(tzinfo=None),
+        })
+        if task.id in self._tasks:
+            raise ValueError(f"Task {task.id} already exists")
+        self._write(task.id, task, task.created_at)
+        counts = self._daily.setdefault(task.created_at.date(), [0, 0])
+        counts[0] += 1
+        counts[1] += task.status == TaskStatus.COMPLETED
+        return task
+    
+    def _update(self, task: Task, values: Dict[str, Any]) -> Task:
+        values["updated_at"] = datetime.utcnow()
+        updated = task.model_copy(update=values)
+        status_changed_at = self._status_changed_at[task.id]
+        if updated.status != task.status:
+            totals = self._durations.setdefault(task.status, [0.0, 0])
+            totals[0] += (updated.updated_at - status_changed_at).total_seconds()
+            totals[1] += 1
+            if updated.status == TaskStatus.COMPLETED:
+                self._daily.setdefault(updated.updated_at.date(), [0, 0])[1] += 1
+            status_changed_at = updated.updated_at
+        self._write(task.id, updated, status_changed_at)
+        return updated
+    
+    def create_task(self, task: Task) -> Task:
+        with self._lock:
+            task = self._insert(task)
+            self._commit()
+            return task
+    
+    def create_tasks(self, tasks: List[Task]) -> List[Task]:
+        # All or nothing, like the single INSERT of the SQLite storage
+        with self.transaction():
+            return [self._insert(task) for task in tasks]
+    
+    def get_task(self, task_id: UUID) -> Optional[Task]:
+        with self._lock:
+            return self._tasks.get(task_id)
+    
+    def _page(
+        self,
+        status: Optional[TaskStatus],
+        skip: int,
+        limit: int,
+        after: Optional[Tuple[datetime, UUID]]
+    ) -> Tuple[List[Task], int]:
+        index = self._by_status[TaskStatus(status).value] if status else self._order
+        # Newest first: walk the ascending index backwards from the cursor
+        end = bisect_left(index, (after[0], str(after[1]))) if after else len(index)
+        stop = max(end - skip, 0)
+        keys = index[max(stop - limit, 0):stop]
+        return [self._tasks[key[2]] for key in reversed(keys)], len(index)
+    
+    def get_tasks(
+        self,
+        status: Optional[TaskStatus] = None,
+        skip: int = 0,
+        limit: int = 10,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        include_total: bool = True
+    ) -> tuple[List[Task], Optional[int]]:
+        with self._lock:
+            tasks, total = self._page(status, skip, limit, after)
+            return tasks, total if include_total else None
+    
+    def get_task_row(self, task_id: UUID, fields: Sequence[str]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            task = self._tasks.get(task_id)
+            return _row(task, fields) if task else None
+    
+    def get_task_rows(
+        self,
+        fields: Sequence[str],
+        status: Optional[TaskStatus] = None,
+        skip: int = 0,
+        limit: int = 10,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        include_total: bool = True
+    ) -> tuple[List[Dict[str, Any]], Optional[int]]:
+        with self._lock:
+            tasks, total = self._page(status, skip, limit, after)
+            return [_row(task, fields) for task in tasks], total if include_total else None
+    
+    def search_tasks(
+        self,
+        query: str,
+        status: Optional[TaskStatus] = None,
+        skip: int = 0,
+        limit: int = 10
+    ) -> tuple[List[Task], int]:
+        """Prefix-match every query word, case-insensitively, in title or description.
+        
+        There is no inverted index: each search scans the tasks (or one
+        status), ranking title matches above description matches.
+        """
+        terms = _words(query)
+        if not terms:
+            return [], 0
+        title_weight, description_weight = _SEARCH_WEIGHTS
+        with self._lock:
+            index = self._by_status[TaskStatus(status).value] if status else self._order
+            tasks = [self._tasks[key[2]] for key in index]
+        ranked = []
+        for task in tasks:
+            title, description = _words(task.title), _words(task.description)
+            score = 0
+            for term in terms:
+                hits = title_weight * _hits(title, term) + description_weight * _hits(description, term)
+                if not hits:
+                    break
+                score += hits
+            else:
+                ranked.append((-score, str(task.id), task))
+        ranked.sort(key=lambda item: item[:2])
+        return [task for _, _, task in ranked[skip:skip + limit]], len(ranked)
+    
+    def export_tasks(
+        self,
+        status: Optional[TaskStatus] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None
+    ) -> Iterator[List[Tuple[Any, ...]]]:
+        """Yield batches of task rows oldest first, holding the lock one batch at a time."""
+        with self._lock:
+            index = self._by_status[TaskStatus(status).value] if status else self._order
+            start = bisect_left(index, (created_after,)) if created_after else 0
+            stop = bisect_left(index, (created_before,)) if created_before else len(index)
+            keys = index[start:stop]
+        for offset in range(0, len(keys), STREAM_BATCH_SIZE):
+            with self._lock:
+                batch = [self._tasks.get(key[2]) for key in keys[offset:offset + STREAM_BATCH_SIZE]]
+            yield [
+                (
+                    str(task.id), task.title, task.description,
+                    TaskStatus(task.status), task.created_at, task.updated_at
+                )
+                for task in batch
+                # Deleted since the export started
+                if task is not None
+            ]
+    
+    def update_task(self, task_id: UUID, changes: Dict[str, Any]) -> Optional[Task]:
+        values = dict(changes)
+        if "status" in values:
+            values["status"] = TaskStatus(values["status"]).value
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is None:
+                return None
+            task = self._update(task, values)
+            self._commit()
+            return task
+    
+    def update_tasks_status(
+        self,
+        status: TaskStatus,
+        ids: Optional[List[UUID]] = None,
+        current_status: Optional[TaskStatus] = None,
+        created_before: Optional[datetime] = None
+    ) -> int:
+        status = TaskStatus(status).value
+        with self._lock:
+            if ids is not None:
+                selected = [self._tasks[task_id] for task_id in set(ids) if task_id in self._tasks]
+            else:
+                index = (
+                    self._by_status[TaskStatus(current_status).value]
+                    if current_status else self._order
+                )
+                stop = bisect_left(index, (created_before,)) if created_before else len(index)
+                selected = [self._tasks[key[2]] for key in index[:stop]]
+            # Tasks already in the target status keep their updated_at
+            selected = [
+                task for task in selected
+                if task.status != status
+                and (current_status is None or task.status == TaskStatus(current_status).value)
+                and (created_before is None or task.created_at < created_before)
+            ]
+            for task in selected:
+                self._update(task, {"status": status})
+            if selected:
+                self._commit()
+            return len(selected)
+    
+    def delete_task(self, task_id: UUID) -> bool:
+        with self._lock:
+            if task_id not in self._tasks:
+                return False
+            self._write(task_id, None)
+            self._commit()
+            return True
+    
+    def get_stats(self, since: date) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "by_status": {
+                    TaskStatus(status): len(index)
+                    for status, index in self._by_status.items()
+                },
+                "daily": [
+                    (day, created, completed)
+                    for day, (created, completed) in sorted(self._daily.items())
+                    if day >= since
+                ],
+                "durations": {
+                    TaskStatus(status): (total_seconds, count)
+                    for status, (total_seconds, count) in self._durations.items()
+                },
+            }
+    
+    def count(self) -> int:
+        with self._lock:
+            return len(self._tasks)
+    
+    def save_snapshot(self, path: Optional[str] = None) -> None:
+        """Write the tasks and rollups to a JSON file, replacing it atomically."""
+        path = path or self.snapshot_path
+        with self._lock:
+            data = orjson.dumps({
+                "tasks": [
+                    {**task.model_dump(), "status_changed_at": self._status_changed_at[task_id]}
+                    for task_id, task in self._tasks.items()
+                ],
+                "daily": [[day, *counts] for day, counts in self._daily.items()],
+                "durations": self._durations,
+            })
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as snapshot:
+            snapshot.write(data)
+        os.replace(tmp_path, path)
+    
+    def load_snapshot(self, path: Optional[str] = None) -> None:
+        """Replace the state with the contents of a snapshot file."""
+        with open(path or self.snapshot_path, "rb") as snapshot:
+            data = orjson.loads(snapshot.read())
+        with self._lock:
+            self._reset()
+            for values in data["tasks"]:
+                status_changed_at = datetime.fromisoformat(values.pop("status_changed_at"))
+                task = Task(**values)
+                self._tasks[task.id] = task
+                self._status_changed_at[task.id] = status_changed_at
+            # One sort per index instead of an insort per task
+            self._order = sorted(_key(task) for task in self._tasks.values())
+            for key in self._order:
+                self._by_status[self._tasks[key[2]].status].append(key)
+            self._daily = {
+                date.fromisoformat(day): [created, completed]
+                for day, created, completed in data["daily"]
+            }
+            self._durations = data["durations"]
+            tasks_version.bump()
+    
+    def close(self) -> None:
+        if self.snapshot_path:
+            self.save_snapshot()
@@ -2,7 +2,19 @@ from datetime import datetime
 from enum import Enum
 from uuid import uuid4
 
-from sqlalchemy import Column, DateTime, Enum as SQLEnum, String, Text
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    DDL,
+    Enum as SQLEnum,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+)
 
 from app.database.connection import Base
 
@@ -15,6 +27,12 @@ class TaskStatusEnum(str, Enum):
 
 class TaskModel(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Covering indexes for the list query: filter by status and/or
+        # order by (created_at, id) without a temp B-tree sort.
+        Index("ix_tasks_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid4()))
     title = Column(String(200), nullable=False)
@@ -22,6 +40,182 @@ class TaskModel(Base):
     status = Column(SQLEnum(TaskStatusEnum), nullable=False, default=TaskStatusEnum.CREATED)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # When the task entered its current status; moved by a trigger
+    status_changed_at = Column(DateTime, default=datetime.utcnow, nullable=True)
 
     def __repr__(self) -> str:
         return f"<Task(id={self.id}, title='{self.title}', status='{self.status}')>"
+
+
+class TaskCounterModel(Base):
+    """Number of tasks per status, maintained by triggers on ``tasks``."""
+
+    __tablename__ = "task_counters"
+
+    status = Column(SQLEnum(TaskStatusEnum), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<TaskCounter(status='{self.status}', count={self.count})>"
+
+
+class TaskDailyStatsModel(Base):
+    """Tasks created and completed per UTC day, maintained by triggers on ``tasks``."""
+
+    __tablename__ = "task_daily_stats"
+
+    day = Column(Date, primary_key=True)
+    created = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<TaskDailyStats(day='{self.day}', created={self.created}, completed={self.completed})>"
+
+
+class TaskStatusDurationModel(Base):
+    """Time tasks spent in each status before leaving it, maintained by triggers."""
+
+    __tablename__ = "task_status_durations"
+
+    status = Column(SQLEnum(TaskStatusEnum), primary_key=True)
+    total_seconds = Column(Float, nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<TaskStatusDuration(status='{self.status}', count={self.count})>"
+
+
+# The counters are kept in the same transaction as every write to ``tasks``,
+# whichever code path issues it, so reading a total is a primary key lookup
+# instead of COUNT(*) over the filtered set. Mirrored by migration 0003.
+TASK_COUNTER_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_counters_insert AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO task_counters (status, count) VALUES (NEW.status, 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_counters_update AFTER UPDATE OF status ON tasks
+    WHEN OLD.status <> NEW.status
+    BEGIN
+        UPDATE task_counters SET count = count - 1 WHERE status = OLD.status;
+        INSERT INTO task_counters (status, count) VALUES (NEW.status, 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_counters_delete AFTER DELETE ON tasks
+    BEGIN
+        UPDATE task_counters SET count = count - 1 WHERE status = OLD.status;
+    END
+    """,
+    # Seed counters for rows that existed before the triggers did.
+    """
+    INSERT OR IGNORE INTO task_counters (status, count)
+    SELECT status, COUNT(*) FROM tasks GROUP BY status
+    """,
+]
+
+for statement in TASK_COUNTER_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement))
+
+
+# Full-text index over title and description. External content: the index
+# stores only tokens and reads text back from ``tasks`` by rowid, so it must
+# be rebuilt if rowids change (VACUUM may renumber them). unicode61 folds
+# case for Cyrillic as well as Latin text. Mirrored by migration 0004.
+TASK_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        title,
+        description,
+        content='tasks',
+        content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (rowid, title, description)
+        VALUES (NEW.rowid, NEW.title, NEW.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+        VALUES ('delete', OLD.rowid, OLD.title, OLD.description);
+        INSERT INTO tasks_fts (rowid, title, description)
+        VALUES (NEW.rowid, NEW.title, NEW.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+        VALUES ('delete', OLD.rowid, OLD.title, OLD.description);
+    END
+    """,
+    # Index rows that existed before the triggers did.
+    """
+    INSERT INTO tasks_fts (tasks_fts)
+    SELECT 'rebuild'
+    WHERE (SELECT COUNT(*) FROM tasks_fts_docsize) <> (SELECT COUNT(*) FROM tasks)
+    """,
+]
+
+for statement in TASK_SEARCH_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement))
+
+
+# Rollups for the stats endpoint, updated in the same transaction as the
+# write like the counters above. Days count events: deleting a task does
+# not rewrite history. Mirrored by migration 0005.
+TASK_ROLLUP_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_rollups_insert AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO task_daily_stats (day, created, completed)
+        VALUES (date(NEW.created_at), 1, NEW.status = 'COMPLETED')
+        ON CONFLICT (day) DO UPDATE SET
+            created = created + 1,
+            completed = completed + excluded.completed;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_rollups_update AFTER UPDATE OF status ON tasks
+    WHEN OLD.status <> NEW.status
+    BEGIN
+        INSERT INTO task_status_durations (status, total_seconds, count)
+        VALUES (
+            OLD.status,
+            (julianday(NEW.updated_at)
+             - julianday(COALESCE(OLD.status_changed_at, OLD.created_at))) * 86400,
+            1
+        )
+        ON CONFLICT (status) DO UPDATE SET
+            total_seconds = total_seconds + excluded.total_seconds,
+            count = count + 1;
+        INSERT INTO task_daily_stats (day, created, completed)
+        SELECT date(NEW.updated_at), 0, 1 WHERE NEW.status = 'COMPLETED'
+        ON CONFLICT (day) DO UPDATE SET completed = completed + 1;
+        UPDATE tasks SET status_changed_at = NEW.updated_at WHERE rowid = NEW.rowid;
+    END
+    """,
+    # Seed the days for rows that existed before the triggers did.
+    """
+    INSERT OR IGNORE INTO task_daily_stats (day, created, completed)
+    SELECT day, SUM(created), SUM(completed) FROM (
+        SELECT date(created_at) AS day, 1 AS created, 0 AS completed FROM tasks
+        UNION ALL
+        SELECT date(updated_at), 0, 1 FROM tasks WHERE status = 'COMPLETED'
+    ) GROUP BY day
+    """,
+]
+
+for statement in TASK_ROLLUP_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement))
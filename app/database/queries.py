@@ -0,0 +1,249 @@
+"""SQL statements shared by the sync and async task storages."""
+
+from datetime import date, datetime
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import (
+    Delete,
+    Insert,
+    Select,
+    Update,
+    column,
+    delete,
+    func,
+    insert,
+    literal_column,
+    select,
+    table,
+    tuple_,
+    update,
+)
+
+from app.database.models import (
+    TaskCounterModel,
+    TaskDailyStatsModel,
+    TaskModel,
+    TaskStatusDurationModel,
+    TaskStatusEnum,
+)
+from app.models.task import Task, TaskStatus
+
+tasks_table = TaskModel.__table__
+
+# Columns that make up a Task; status_changed_at is bookkeeping for the rollups
+task_columns = tuple(column for column in tasks_table.c if column.name != "status_changed_at")
+
+# Names a client may project with ?fields=
+TASK_FIELDS = tuple(column.name for column in task_columns)
+
+# FTS5 index over tasks, created by DDL outside the ORM metadata
+tasks_fts = table("tasks_fts", column("rowid"), column("title"), column("description"))
+
+# bm25 column weights: a hit in the title outranks one in the description
+SEARCH_WEIGHTS = (10.0, 1.0)
+
+
+def task_to_row(task: Task) -> Dict[str, Any]:
+    """Convert a task into column values for the tasks table."""
+    # SQLite stores naive UTC timestamps; drop tzinfo up front so tasks
+    # returned from a write match what a later read of the row yields.
+    return {
+        "id": str(task.id),
+        "title": task.title,
+        "description": task.description,
+        "status": TaskStatusEnum(task.status),
+        "created_at": task.created_at.replace(tzinfo=None),
+        "updated_at": task.updated_at.replace(tzinfo=None),
+        "status_changed_at": task.created_at.replace(tzinfo=None),
+    }
+
+
+def row_to_task(row: Mapping[str, Any]) -> Task:
+    """Convert a tasks table row into a task."""
+    # Raw column values: pydantic parses the id string and matches the
+    # status by value in one validation pass.
+    return Task(
+        id=row["id"],
+        title=row["title"],
+        description=row["description"],
+        status=row["status"],
+        created_at=row["created_at"],
+        updated_at=row["updated_at"]
+    )
+
+
+def _columns(fields: Optional[Sequence[str]]) -> Sequence[Any]:
+    return [tasks_table.c[name] for name in fields] if fields else task_columns
+
+
+def select_tasks(
+    status: Optional[TaskStatus] = None,
+    fields: Optional[Sequence[str]] = None
+) -> Select:
+    """Select task rows, or only the given fields, optionally filtered by status."""
+    # Plain rows rather than ORM instances: nothing lands in the session's
+    # identity map, so reads after a set-based write never see stale state.
+    stmt = select(*_columns(fields))
+    if status:
+        stmt = stmt.where(tasks_table.c.status == TaskStatusEnum(status))
+    return stmt
+
+
+def select_task(task_id: UUID, fields: Optional[Sequence[str]] = None) -> Select:
+    """Select a single task row, or only the given fields, by id."""
+    return select(*_columns(fields)).where(tasks_table.c.id == str(task_id))
+
+
+def seek_after(stmt: Select, after: Tuple[datetime, UUID]) -> Select:
+    """Continue strictly after the (created_at, id) of a previously seen task."""
+    created_at, task_id = after
+    return stmt.where(
+        tuple_(tasks_table.c.created_at, tasks_table.c.id) < tuple_(created_at, str(task_id))
+    )
+
+
+def order_tasks(stmt: Select) -> Select:
+    """Order tasks newest first."""
+    # id breaks ties so the order matches the list indexes.
+    return stmt.order_by(tasks_table.c.created_at.desc(), tasks_table.c.id.desc())
+
+
+def select_page(
+    status: Optional[TaskStatus] = None,
+    skip: int = 0,
+    limit: int = 10,
+    after: Optional[Tuple[datetime, UUID]] = None,
+    fields: Optional[Sequence[str]] = None
+) -> Select:
+    """Select one page of the task list, newest first."""
+    stmt = select_tasks(status, fields)
+    if after:
+        stmt = seek_after(stmt, after)
+    return order_tasks(stmt).offset(skip).limit(limit)
+
+
+def export_tasks(
+    status: Optional[TaskStatus] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None
+) -> Select:
+    """Select task rows for export, oldest first along the list indexes."""
+    stmt = select_tasks(status)
+    if created_after:
+        stmt = stmt.where(tasks_table.c.created_at >= created_after)
+    if created_before:
+        stmt = stmt.where(tasks_table.c.created_at < created_before)
+    return stmt.order_by(tasks_table.c.created_at, tasks_table.c.id)
+
+
+def count_tasks(status: Optional[TaskStatus] = None) -> Select:
+    """Count tasks from the trigger-maintained counters instead of COUNT(*)."""
+    stmt = select(func.coalesce(func.sum(TaskCounterModel.count), 0))
+    if status:
+        stmt = stmt.where(TaskCounterModel.status == TaskStatusEnum(status))
+    return stmt
+
+
+def match_query(text: str) -> Optional[str]:
+    """Turn free text into an FTS5 query, or None if it has no terms.
+    
+    Every word is quoted, so user input cannot inject FTS5 syntax, and
+    matched as a prefix; all words must match.
+    """
+    terms = ['"{}"*'.format(term.replace('"', '""')) for term in text.split()]
+    return " ".join(terms) or None
+
+
+def _search_match(match: str, status: Optional[TaskStatus]) -> Select:
+    stmt = (
+        select(*task_columns)
+        .select_from(tasks_fts)
+        .join(tasks_table, literal_column("tasks.rowid") == tasks_fts.c.rowid)
+        .where(literal_column("tasks_fts").op("MATCH")(match))
+    )
+    if status:
+        stmt = stmt.where(tasks_table.c.status == TaskStatusEnum(status))
+    return stmt
+
+
+def search_tasks(match: str, status: Optional[TaskStatus] = None) -> Select:
+    """Select task rows matching an FTS5 query, best match first."""
+    rank = func.bm25(literal_column("tasks_fts"), *SEARCH_WEIGHTS)
+    return _search_match(match, status).order_by(rank, tasks_table.c.id)
+
+
+def count_search_tasks(match: str, status: Optional[TaskStatus] = None) -> Select:
+    """Count task rows matching an FTS5 query."""
+    return _search_match(match, status).with_only_columns(func.count())
+
+
+def select_daily_stats(since: date) -> Select:
+    """Select the per-day created/completed rollups from a day on, oldest first."""
+    return (
+        select(TaskDailyStatsModel.day, TaskDailyStatsModel.created, TaskDailyStatsModel.completed)
+        .where(TaskDailyStatsModel.day >= since)
+        .order_by(TaskDailyStatsModel.day)
+    )
+
+
+def select_status_durations() -> Select:
+    """Select the time-in-status rollups."""
+    return select(
+        TaskStatusDurationModel.status,
+        TaskStatusDurationModel.total_seconds,
+        TaskStatusDurationModel.count,
+    )
+
+
+def select_status_counts() -> Select:
+    """Select the per-status task counters."""
+    return select(TaskCounterModel.status, TaskCounterModel.count)
+
+
+def insert_tasks() -> Insert:
+    """Insert task rows; execute with a list of rows for an executemany."""
+    return insert(tasks_table)
+
+
+def update_task(task_id: UUID, changes: Dict[str, Any]) -> Update:
+    """Update the given fields of a task and return the resulting row."""
+    values = dict(changes)
+    if "status" in values:
+        values["status"] = TaskStatusEnum(values["status"])
+    # One round trip: UPDATE ... RETURNING instead of load, modify, flush
+    # and refresh. updated_at is set by the column's onupdate.
+    return (
+        update(tasks_table)
+        .where(tasks_table.c.id == str(task_id))
+        .values(**values)
+        .returning(*task_columns)
+    )
+
+
+def update_tasks_status(
+    status: TaskStatus,
+    ids: Optional[List[UUID]] = None,
+    current_status: Optional[TaskStatus] = None,
+    created_before: Optional[datetime] = None
+) -> Update:
+    """Move every selected task to a new status in a single statement."""
+    # Tasks already in the target status are left alone so their
+    # updated_at does not move.
+    stmt = (
+        update(tasks_table)
+        .where(tasks_table.c.status != TaskStatusEnum(status))
+        .values(status=TaskStatusEnum(status))
+    )
+    if ids is not None:
+        stmt = stmt.where(tasks_table.c.id.in_([str(task_id) for task_id in ids]))
+    if current_status:
+        stmt = stmt.where(tasks_table.c.status == TaskStatusEnum(current_status))
+    if created_before:
+        stmt = stmt.where(tasks_table.c.created_at < created_before)
+    return stmt
+
+
+def delete_task(task_id: UUID) -> Delete:
+    """Delete a task by id."""
+    return delete(tasks_table).where(tasks_table.c.id == str(task_id))
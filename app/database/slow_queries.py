@@ -0,0 +1,118 @@
+"""Slow-query log.
+
+Statements slower than a threshold are logged with their bound
+parameters, duration, the storage method that issued them and SQLite's
+query plan. Fast statements only pay for two ``perf_counter()`` calls; the
+caller lookup and the EXPLAIN run only for offenders.
+"""
+
+import logging
+import os
+import sys
+import time
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Statements running at least this long are logged; 0 turns the log off
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+
+# Longer parameter lists (executemany) are cut in the log
+MAX_PARAMETERS_LENGTH = 500
+
+logger = logging.getLogger("app.database.slow_queries")
+
+_STORAGE_FILES = ("storage.py", "async_storage.py")
+
+
+def _storage_frames() -> List[Any]:
+    """Frames of the current call stack, innermost first.
+    
+    Statements of the aiosqlite storage run in a greenlet spawned from the
+    coroutine, so the stack continues in the parent greenlet's frames.
+    """
+    frames = []
+    frame = sys._getframe(2)
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    greenlet = sys.modules.get("greenlet")
+    if greenlet is not None:
+        parent = greenlet.getcurrent().parent
+        frame = parent.gr_frame if parent is not None else None
+        while frame is not None:
+            frames.append(frame)
+            frame = frame.f_back
+    return frames
+
+
+def storage_caller() -> Optional[str]:
+    """Name the public storage method, e.g. ``TaskStorage.get_tasks``, on the stack."""
+    for frame in _storage_frames():
+        code = frame.f_code
+        if code.co_name.startswith("_") or not code.co_filename.endswith(_STORAGE_FILES):
+            continue
+        owner = frame.f_locals.get("self")
+        if owner is not None and type(owner).__name__.endswith("TaskStorage"):
+            return f"{type(owner).__name__}.{code.co_name}"
+    return None
+
+
+def format_plan(rows: Sequence[Tuple[Any, ...]]) -> str:
+    """Indent EXPLAIN QUERY PLAN rows (id, parent, notused, detail) as a tree."""
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return "\n".join(lines)
+
+
+def explain(connection: Any, statement: str, parameters: Any, executemany: bool) -> str:
+    """Return the query plan of a statement, run on a fresh cursor."""
+    if executemany:
+        parameters = parameters[0] if parameters else ()
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return format_plan(cursor.fetchall())
+    except Exception as e:
+        return f"unavailable: {e}"
+    finally:
+        cursor.close()
+
+
+def log_slow_queries(engine: Engine, threshold_ms: float = SLOW_QUERY_MS) -> None:
+    """Log the engine's statements that take at least threshold_ms."""
+    threshold = threshold_ms / 1000
+    
+    def before_cursor_execute(
+        conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        if context is not None:
+            context.slow_query_started = time.perf_counter()
+    
+    def after_cursor_execute(
+        conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        started = getattr(context, "slow_query_started", None)
+        if started is None:
+            return
+        duration = time.perf_counter() - started
+        if duration < threshold:
+            return
+        shown = repr(parameters)
+        if len(shown) > MAX_PARAMETERS_LENGTH:
+            shown = shown[:MAX_PARAMETERS_LENGTH] + "..."
+        logger.warning(
+            "Slow query: %.1f ms in %s\n%s\nParameters: %s\nPlan:\n%s",
+            duration * 1000,
+            storage_caller() or "unknown caller",
+            statement,
+            shown,
+            explain(conn, statement, parameters, executemany),
+        )
+    
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
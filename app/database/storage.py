@@ -1,112 +1,196 @@
-from typing import List, Optional
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 from uuid import UUID
 
-from app.database.connection import get_db
-from app.database.models import TaskModel, TaskStatusEnum
+from sqlalchemy import Row
+from sqlalchemy.orm import Session
+
+from app.database import queries
+from app.database.base import BaseTaskStorage
+from app.database.connection import SessionLocal
+from app.database.version import tasks_version
 from app.models.task import Task, TaskStatus
 
+# Rows fetched per round trip when streaming a result set
+STREAM_BATCH_SIZE = 1000
+
 
-class TaskStorage:
-    def __init__(self) -> None:
-        pass
-    
-    def _convert_to_model(self, task: Task) -> TaskModel:
-        return TaskModel(
-            id=str(task.id),
-            title=task.title,
-            description=task.description,
-            status=TaskStatusEnum(task.status),
-            created_at=task.created_at,
-            updated_at=task.updated_at
-        )
-    
-    def _convert_from_model(self, task_model: TaskModel) -> Task:
-        return Task(
-            id=UUID(task_model.id),
-            title=task_model.title,
-            description=task_model.description,
-            status=TaskStatus(task_model.status),
-            created_at=task_model.created_at,
-            updated_at=task_model.updated_at
-        )
+class TaskStorage(BaseTaskStorage):
+    """SQLite task storage.
     
-    def create_task(self, task: Task) -> Task:
-        db = next(get_db())
+    Bound to a session, every call reuses it (one connection per request);
+    unbound, each call opens and closes its own session. With
+    ``autocommit=False`` writes are only flushed and the owner of the
+    session commits, see ``transaction()``.
+    """
+    
+    def __init__(self, db: Optional[Session] = None, autocommit: bool = True) -> None:
+        self.db = db
+        self.autocommit = autocommit
+    
+    @contextmanager
+    def _session(self) -> Iterator[Session]:
+        if self.db is not None:
+            yield self.db
+            return
+        db = SessionLocal()
         try:
-            task_model = self._convert_to_model(task)
-            db.add(task_model)
-            db.commit()
-            db.refresh(task_model)
-            return self._convert_from_model(task_model)
+            yield db
         finally:
             db.close()
     
+    def _commit(self, db: Session) -> None:
+        if self.autocommit:
+            db.commit()
+            tasks_version.bump()
+        else:
+            db.flush()
+    
+    @contextmanager
+    def transaction(self) -> Iterator["TaskStorage"]:
+        """Yield a storage whose writes are committed once, on exit.
+        
+        Everything done through the yielded storage is rolled back if the
+        block raises.
+        """
+        with self._session() as db:
+            try:
+                yield TaskStorage(db, autocommit=False)
+                db.commit()
+                tasks_version.bump()
+            except Exception:
+                db.rollback()
+                raise
+    
+    def create_task(self, task: Task) -> Task:
+        with self._session() as db:
+            row = queries.task_to_row(task)
+            db.execute(queries.insert_tasks(), [row])
+            self._commit(db)
+            return queries.row_to_task(row)
+    
+    def create_tasks(self, tasks: List[Task]) -> List[Task]:
+        with self._session() as db:
+            rows = [queries.task_to_row(task) for task in tasks]
+            # One executemany INSERT and a single commit for the whole batch.
+            db.execute(queries.insert_tasks(), rows)
+            self._commit(db)
+            return [queries.row_to_task(row) for row in rows]
+    
     def get_task(self, task_id: UUID) -> Optional[Task]:
-        db = next(get_db())
-        try:
-            task_model = db.query(TaskModel).filter(TaskModel.id == str(task_id)).first()
-            if task_model:
-                return self._convert_from_model(task_model)
+        with self._session() as db:
+            row = db.execute(queries.select_task(task_id)).mappings().first()
+            if row:
+                return queries.row_to_task(row)
             return None
-        finally:
-            db.close()
     
     def get_tasks(
         self,
         status: Optional[TaskStatus] = None,
         skip: int = 0,
-        limit: int = 10
-    ) -> tuple[List[Task], int]:
-        db = next(get_db())
-        try:
-            query = db.query(TaskModel)
+        limit: int = 10,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        include_total: bool = True
+    ) -> tuple[List[Task], Optional[int]]:
+        with self._session() as db:
+            total = db.execute(queries.count_tasks(status)).scalar_one() if include_total else None
+            rows = db.execute(queries.select_page(status, skip, limit, after)).mappings()
             
-            if status:
-                query = query.filter(TaskModel.status == TaskStatusEnum(status))
-            
-            total = query.count()
-            tasks = query.order_by(TaskModel.created_at.desc()).offset(skip).limit(limit).all()
-            
-            return [self._convert_from_model(task) for task in tasks], total
-        finally:
-            db.close()
+            return [queries.row_to_task(row) for row in rows], total
     
-    def update_task(self, task_id: UUID, updated_task: Task) -> Optional[Task]:
-        db = next(get_db())
-        try:
-            task_model = db.query(TaskModel).filter(TaskModel.id == str(task_id)).first()
-            if not task_model:
-                return None
+    def get_task_row(self, task_id: UUID, fields: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """Read only the given columns of a task."""
+        with self._session() as db:
+            row = db.execute(queries.select_task(task_id, fields)).mappings().first()
+            return dict(row) if row else None
+    
+    def get_task_rows(
+        self,
+        fields: Sequence[str],
+        status: Optional[TaskStatus] = None,
+        skip: int = 0,
+        limit: int = 10,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        include_total: bool = True
+    ) -> tuple[List[Dict[str, Any]], Optional[int]]:
+        """Read a page of the task list with only the given columns."""
+        with self._session() as db:
+            total = db.execute(queries.count_tasks(status)).scalar_one() if include_total else None
+            stmt = queries.select_page(status, skip, limit, after, fields)
             
-            task_model.title = updated_task.title
-            task_model.description = updated_task.description
-            task_model.status = TaskStatusEnum(updated_task.status)
+            return [dict(row) for row in db.execute(stmt).mappings()], total
+    
+    def search_tasks(
+        self,
+        query: str,
+        status: Optional[TaskStatus] = None,
+        skip: int = 0,
+        limit: int = 10
+    ) -> tuple[List[Task], int]:
+        match = queries.match_query(query)
+        if match is None:
+            return [], 0
+        with self._session() as db:
+            total = db.execute(queries.count_search_tasks(match, status)).scalar_one()
+            stmt = queries.search_tasks(match, status).offset(skip).limit(limit)
+            rows = db.execute(stmt).mappings()
             
-            db.commit()
-            db.refresh(task_model)
-            return self._convert_from_model(task_model)
-        finally:
-            db.close()
+            return [queries.row_to_task(row) for row in rows], total
+    
+    def export_tasks(
+        self,
+        status: Optional[TaskStatus] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None
+    ) -> Iterator[Sequence[Row]]:
+        """Stream raw task rows in batches rather than all at once."""
+        with self._session() as db:
+            stmt = queries.export_tasks(status, created_after, created_before)
+            result = db.execute(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+            yield from result.partitions()
+    
+    def update_task(self, task_id: UUID, changes: Dict[str, Any]) -> Optional[Task]:
+        with self._session() as db:
+            row = db.execute(queries.update_task(task_id, changes)).mappings().first()
+            self._commit(db)
+            return queries.row_to_task(row) if row else None
+    
+    def update_tasks_status(
+        self,
+        status: TaskStatus,
+        ids: Optional[List[UUID]] = None,
+        current_status: Optional[TaskStatus] = None,
+        created_before: Optional[datetime] = None
+    ) -> int:
+        with self._session() as db:
+            result = db.execute(
+                queries.update_tasks_status(status, ids, current_status, created_before)
+            )
+            self._commit(db)
+            return result.rowcount
     
     def delete_task(self, task_id: UUID) -> bool:
-        db = next(get_db())
-        try:
-            task_model = db.query(TaskModel).filter(TaskModel.id == str(task_id)).first()
-            if not task_model:
-                return False
-            
-            db.delete(task_model)
-            db.commit()
-            return True
-        finally:
-            db.close()
+        with self._session() as db:
+            result = db.execute(queries.delete_task(task_id))
+            self._commit(db)
+            return result.rowcount > 0
+    
+    def get_stats(self, since: date) -> Dict[str, Any]:
+        """Read the rollups: per-status counts, days since a date, time in status."""
+        with self._session() as db:
+            return {
+                "by_status": {
+                    TaskStatus(status): count
+                    for status, count in db.execute(queries.select_status_counts())
+                },
+                "daily": db.execute(queries.select_daily_stats(since)).all(),
+                "durations": {
+                    TaskStatus(status): (total_seconds, count)
+                    for status, total_seconds, count in db.execute(queries.select_status_durations())
+                },
+            }
     
     def count(self) -> int:
-        db = next(get_db())
-        try:
-            return db.query(TaskModel).count()
-        finally:
-            db.close()
-
-
-task_storage = TaskStorage()
+        with self._session() as db:
+            return db.execute(queries.count_tasks()).scalar_one()
@@ -0,0 +1,28 @@
+"""Write versions for cache invalidation."""
+
+import threading
+
+
+class WriteVersion:
+    """Counter of committed writes to a table made by this process.
+    
+    Caches tag entries with the version current before they read, so any
+    commit through the storages makes older entries unreachable.
+    """
+    
+    def __init__(self) -> None:
+        self._value = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def value(self) -> int:
+        return self._value
+    
+    def bump(self) -> int:
+        """Record a committed write and return the new version."""
+        with self._lock:
+            self._value += 1
+            return self._value
+
+
+tasks_version = WriteVersion()
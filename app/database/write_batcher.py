@@ -0,0 +1,173 @@
+"""Group commit for task writes.
+
+SQLite has a single writer and every commit pays for a WAL append and
+possibly an fsync. Under bursts, committing each create/update/delete on
+its own makes writers queue on the lock. The batcher funnels those writes
+through one thread, which takes whatever has arrived within a short window,
+runs it in one transaction and then resolves each caller's future.
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from app.database.async_storage import ThreadpoolTaskStorage
+from app.database.storage import TaskStorage
+from app.models.task import Task
+
+WRITE_BATCHING = os.getenv("WRITE_BATCHING", "False").lower() == "true"
+WRITE_BATCH_MAX_SIZE = int(os.getenv("WRITE_BATCH_MAX_SIZE", "64"))
+WRITE_BATCH_MAX_WAIT_MS = float(os.getenv("WRITE_BATCH_MAX_WAIT_MS", "2"))
+
+logger = logging.getLogger("app.database.write_batcher")
+
+
+class _Write(NamedTuple):
+    method: str
+    args: tuple
+    future: Future
+
+
+class WriteBatcher:
+    """Coalesce concurrent storage writes into shared transactions."""
+    
+    def __init__(
+        self,
+        max_batch_size: int = WRITE_BATCH_MAX_SIZE,
+        max_wait_ms: float = WRITE_BATCH_MAX_WAIT_MS,
+        storage: Optional[TaskStorage] = None,
+    ) -> None:
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.storage = storage or TaskStorage()
+        self.commits = 0
+        self.writes = 0
+        self._queue: "queue.Queue[Optional[_Write]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+    
+    def submit(self, method: str, *args: Any) -> Future:
+        """Queue a call to a TaskStorage write method and return its future."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="task-write-batcher", daemon=True
+                )
+                self._thread.start()
+        future: Future = Future()
+        self._queue.put(_Write(method, args, future))
+        return future
+    
+    def close(self) -> None:
+        """Flush pending writes and stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+    
+    def _run(self) -> None:
+        while True:
+            batch, stop = self._collect()
+            # Cancelled callers (a disconnected client, a timeout) are
+            # dropped; the rest can no longer be cancelled.
+            batch = [write for write in batch if write.future.set_running_or_notify_cancel()]
+            try:
+                self._execute(batch)
+            except Exception as e:
+                # Never let the thread die: later submits would wait forever
+                logger.exception("Write batch failed")
+                for write in batch:
+                    _set_exception(write.future, e)
+            if stop:
+                return
+    
+    def _collect(self) -> Tuple[List[_Write], bool]:
+        """Wait for a write, then take what else arrives within the window."""
+        batch: List[_Write] = []
+        deadline = None
+        while len(batch) < self.max_batch_size:
+            try:
+                if deadline is None:
+                    write = self._queue.get()
+                    deadline = time.monotonic() + self.max_wait
+                elif deadline > time.monotonic():
+                    write = self._queue.get(timeout=deadline - time.monotonic())
+                else:
+                    write = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if write is None:
+                return batch, True
+            batch.append(write)
+        return batch, False
+    
+    def _execute(self, batch: List[_Write]) -> None:
+        if not batch:
+            return
+        try:
+            with self.storage.transaction() as storage:
+                results = [getattr(storage, write.method)(*write.args) for write in batch]
+        except Exception:
+            # Something in the batch failed and the whole transaction rolled
+            # back; replay the writes one by one so only the offending caller
+            # sees the error.
+            for write in batch:
+                try:
+                    result = getattr(self.storage, write.method)(*write.args)
+                except Exception as e:
+                    _set_exception(write.future, e)
+                else:
+                    _set_result(write.future, result)
+            self.commits += len(batch)
+        else:
+            for write, result in zip(batch, results):
+                _set_result(write.future, result)
+            self.commits += 1
+        self.writes += len(batch)
+
+
+def _set_result(future: Future, result: Any) -> None:
+    # A future already resolved must not stop the rest of the batch
+    try:
+        future.set_result(result)
+    except InvalidStateError:
+        pass
+
+
+def _set_exception(future: Future, error: Exception) -> None:
+    try:
+        future.set_exception(error)
+    except InvalidStateError:
+        pass
+
+
+class BatchingTaskStorage(ThreadpoolTaskStorage):
+    """Async storage facade that routes single-task writes through a batcher.
+    
+    Reads and set-based writes still run on the wrapped storage in the
+    threadpool; create, update and delete wait on the batcher without
+    holding a worker thread.
+    """
+    
+    def __init__(self, storage: TaskStorage, batcher: WriteBatcher) -> None:
+        super().__init__(storage)
+        self.batcher = batcher
+    
+    async def create_task(self, task: Task) -> Task:
+        return await asyncio.wrap_future(self.batcher.submit("create_task", task))
+    
+    async def update_task(self, task_id: UUID, changes: Dict[str, Any]) -> Optional[Task]:
+        return await asyncio.wrap_future(self.batcher.submit("update_task", task_id, changes))
+    
+    async def delete_task(self, task_id: UUID) -> bool:
+        return await asyncio.wrap_future(self.batcher.submit("delete_task", task_id))
+
+
+write_batcher = WriteBatcher() if WRITE_BATCHING else None
@@ -1,13 +1,18 @@
 import os
-from typing import Dict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
+from app import metrics
 from app.api.tasks import router as tasks_router
-from app.database.connection import engine
+from app.database.backends import task_storage
+from app.database.connection import async_engine, async_read_engine, engine, read_engine
 from app.database.models import Base
+from app.database.write_batcher import write_batcher
+from app.services.cache import task_cache, task_list_cache
 
 load_dotenv()
 
@@ -15,6 +20,17 @@ app_name = os.getenv("APP_NAME", "Task Manager")
 app_version = os.getenv("APP_VERSION", "1.0.0")
 debug = os.getenv("DEBUG", "False").lower() == "true"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    # Commit writes still queued for group commit before exiting
+    if write_batcher is not None:
+        write_batcher.close()
+    # Snapshot the memory backend, if configured to
+    task_storage.close()
+
+
 app = FastAPI(
     title=app_name,
     version=app_version,
@@ -23,6 +39,7 @@ app = FastAPI(
     redoc_url="/redoc",
     openapi_url="/openapi.json",
     debug=debug,
+    lifespan=lifespan,
 )
 
 cors_origins = os.getenv("CORS_ORIGINS", "[]")
@@ -53,6 +70,14 @@ if os.getenv("DEBUG", "False").lower() == "true":
 
 app.include_router(tasks_router, prefix="/api/v1")
 
+if metrics.METRICS_ENABLED:
+    # Added last, so it is the outermost middleware and times everything
+    app.add_middleware(metrics.MetricsMiddleware)
+    metrics.instrument_engine(engine, "write")
+    metrics.instrument_engine(read_engine, "read")
+    metrics.instrument_engine(async_engine.sync_engine, "async_write")
+    metrics.instrument_engine(async_read_engine.sync_engine, "async_read")
+
 
 @app.get("/", tags=["root"])
 def read_root() -> Dict[str, str]:
@@ -69,6 +94,18 @@ def health_check() -> Dict[str, str]:
     return {"status": "healthy"}
 
 
+@app.get("/cache/stats", tags=["health"])
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    return {"tasks": task_cache.stats(), "lists": task_list_cache.stats()}
+
+
+@app.get("/metrics", tags=["health"])
+async def prometheus_metrics() -> Response:
+    # Async so the threadpool is sampled from the event loop, not from it
+    metrics.sample_threadpool()
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     import uvicorn
     
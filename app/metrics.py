@@ -0,0 +1,272 @@
+"""Prometheus metrics for requests, the threadpool and database statements.
+
+Kept in-process and rendered in the Prometheus text format by ``GET
+/metrics``. HTTP metrics come from an ASGI middleware, statement timings
+from SQLAlchemy cursor events on each engine.
+"""
+
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Sequence, Tuple
+
+import anyio.to_thread
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """A metric family: one value per combination of label values."""
+    
+    kind = ""
+    
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: Dict[Labels, Any] = {}
+        self._lock = threading.Lock()
+    
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    kind = "counter"
+    
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+    
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+            for labels, value in values
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+    
+    def dec(self, labels: Labels = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+    
+    def set(self, value: float, labels: Labels = ()) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = HTTP_BUCKETS
+    ) -> None:
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(buckets)
+    
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        # Per-bucket counts, made cumulative when rendered; the last two
+        # slots hold the sum and the count.
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                counts = self._values[labels] = [0] * (len(self.buckets) + 3)
+            counts[index] += 1
+            counts[-2] += value
+            counts[-1] += 1
+    
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted((labels, list(counts)) for labels, counts in self._values.items())
+        lines = self.header()
+        names = self.label_names + ("le",)
+        for labels, counts in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                bucket_labels = _format_labels(names, labels + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            label_text = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(counts[-2])}")
+            lines.append(f"{self.name}_count{label_text} {counts[-1]}")
+        return lines
+
+
+http_requests_total = Counter(
+    "http_requests_total", "HTTP requests handled.", ("method", "route", "status")
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of the response.",
+    ("method", "route", "status"),
+)
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress", "HTTP requests being handled.", ("method",)
+)
+threadpool_threads_max = Gauge(
+    "threadpool_threads_max", "Worker threads the threadpool may run at once."
+)
+threadpool_threads_busy = Gauge(
+    "threadpool_threads_busy", "Worker threads running sync code (storage calls, sync routes)."
+)
+threadpool_tasks_waiting = Gauge(
+    "threadpool_tasks_waiting", "Calls queued for a free worker thread."
+)
+db_statement_duration_seconds = Histogram(
+    "db_statement_duration_seconds",
+    "Time spent executing SQL statements.",
+    ("engine", "statement", "table"),
+    buckets=DB_BUCKETS,
+)
+
+REGISTRY: List[_Metric] = [
+    http_requests_total,
+    http_request_duration_seconds,
+    http_requests_in_progress,
+    threadpool_threads_max,
+    threadpool_threads_busy,
+    threadpool_tasks_waiting,
+    db_statement_duration_seconds,
+]
+
+
+def sample_threadpool() -> None:
+    """Record the saturation of the threadpool; call from the event loop."""
+    statistics = anyio.to_thread.current_default_thread_limiter().statistics()
+    threadpool_threads_max.set(statistics.total_tokens)
+    threadpool_threads_busy.set(statistics.borrowed_tokens)
+    threadpool_tasks_waiting.set(statistics.tasks_waiting)
+
+
+def render() -> str:
+    """Render every metric in the Prometheus text format."""
+    lines = [line for metric in REGISTRY for line in metric.render()]
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """Count and time requests by method, route template and status code.
+    
+    A plain ASGI middleware, so streamed responses are timed until their
+    last chunk is sent. Paths that match no route share one label.
+    """
+    
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        method = scope["method"]
+        status = 500
+        
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        http_requests_in_progress.inc((method,))
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - started
+            http_requests_in_progress.dec((method,))
+            # Set by the router on the scope once a route matched
+            route = scope.get("route")
+            labels = (method, getattr(route, "path", "unmatched"), str(status))
+            http_requests_total.inc(labels)
+            http_request_duration_seconds.observe(duration, labels)
+
+
+_STATEMENT = re.compile(r"^\s*(\w+)")
+_TABLE = re.compile(r'\b(?:FROM|INTO|UPDATE|JOIN)\s+"?(\w+)', re.IGNORECASE)
+
+# Statements are a small set of repeated strings: parse each one once
+_STATEMENT_LABELS: Dict[str, Tuple[str, str]] = {}
+_STATEMENT_LABELS_MAX = 1024
+
+
+def statement_labels(statement: str) -> Tuple[str, str]:
+    """Return the (statement kind, first table) labels of a SQL string."""
+    labels = _STATEMENT_LABELS.get(statement)
+    if labels is None:
+        kind, table = _STATEMENT.match(statement), _TABLE.search(statement)
+        labels = (
+            kind.group(1).upper() if kind else "OTHER",
+            table.group(1) if table else "",
+        )
+        if len(_STATEMENT_LABELS) >= _STATEMENT_LABELS_MAX:
+            _STATEMENT_LABELS.clear()
+        _STATEMENT_LABELS[statement] = labels
+    return labels
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Time every statement the engine runs."""
+    
+    def before_cursor_execute(
+        conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        conn.info.setdefault("statement_started", []).append(time.perf_counter())
+    
+    def after_cursor_execute(
+        conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        duration = time.perf_counter() - conn.info["statement_started"].pop()
+        db_statement_duration_seconds.observe(duration, (name,) + statement_labels(statement))
+    
+    def handle_error(exception_context: Any) -> None:
+        # A failed statement never reaches after_cursor_execute
+        conn = exception_context.connection
+        started = conn.info.get("statement_started") if conn is not None else None
+        if started:
+            started.pop()
+    
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine, "handle_error", handle_error)
@@ -5,6 +5,13 @@ from .task_schemas import (
     TaskResponse,
     TaskUpdate,
     TaskListResponse,
+    TaskStatusBulkUpdate,
+    TaskStatusBulkUpdateResponse,
+    TaskImportError,
+    TaskImportResponse,
+    TaskDailyStats,
+    TaskStatusDuration,
+    TaskStatsResponse,
     PaginationParams,
 )
 
@@ -13,5 +20,12 @@ __all__ = [
     "TaskResponse", 
     "TaskUpdate",
     "TaskListResponse",
+    "TaskStatusBulkUpdate",
+    "TaskStatusBulkUpdateResponse",
+    "TaskImportError",
+    "TaskImportResponse",
+    "TaskDailyStats",
+    "TaskStatusDuration",
+    "TaskStatsResponse",
     "PaginationParams",
 ]
@@ -1,10 +1,10 @@
 """Task schemas for API requests and responses."""
 
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Dict, List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from app.models.task import TaskStatus
 
@@ -47,6 +47,95 @@ class TaskUpdate(BaseModel):
         }
 
 
+class TaskStatusBulkUpdate(BaseModel):
+    """Schema for moving many tasks to a new status at once."""
+    
+    status: TaskStatus = Field(..., description="New task status")
+    ids: Optional[List[UUID]] = Field(
+        None,
+        min_length=1,
+        max_length=5000,
+        description="Identifiers of the tasks to update"
+    )
+    current_status: Optional[TaskStatus] = Field(
+        None,
+        description="Only update tasks currently in this status"
+    )
+    created_before: Optional[datetime] = Field(
+        None,
+        description="Only update tasks created before this timestamp"
+    )
+    
+    @model_validator(mode="after")
+    def check_selection(self) -> "TaskStatusBulkUpdate":
+        """Refuse to update every task when no selection is given."""
+        if self.ids is None and self.current_status is None and self.created_before is None:
+            raise ValueError("Specify ids, current_status or created_before")
+        return self
+    
+    class Config:
+        """Pydantic configuration."""
+        
+        schema_extra = {
+            "example": {
+                "status": "завершено",
+                "current_status": "в работе",
+                "created_before": "2023-12-01T10:00:00"
+            }
+        }
+
+
+class TaskStatusBulkUpdateResponse(BaseModel):
+    """Schema for bulk status update response."""
+    
+    updated: int = Field(..., description="Number of tasks whose status changed")
+
+
+class TaskImportError(BaseModel):
+    """Schema for a rejected line of an import."""
+    
+    line: int = Field(..., description="1-based line number in the uploaded body")
+    error: str = Field(..., description="Why the line was rejected")
+
+
+class TaskImportResponse(BaseModel):
+    """Schema for import summary."""
+    
+    imported: int = Field(default=0, description="Number of tasks created")
+    failed: int = Field(default=0, description="Number of rejected lines")
+    errors: List[TaskImportError] = Field(
+        default_factory=list,
+        description="Rejected lines; only the first ones are listed when there are many"
+    )
+
+
+class TaskDailyStats(BaseModel):
+    """Schema for one day of task activity."""
+    
+    day: date = Field(..., description="UTC day")
+    created: int = Field(..., description="Tasks created that day")
+    completed: int = Field(..., description="Tasks completed that day")
+
+
+class TaskStatusDuration(BaseModel):
+    """Schema for time spent in a status."""
+    
+    average_seconds: float = Field(..., description="Average time before leaving the status")
+    transitions: int = Field(..., description="Number of times tasks left the status")
+
+
+class TaskStatsResponse(BaseModel):
+    """Schema for aggregated task statistics."""
+    
+    total: int = Field(..., description="Total number of tasks")
+    by_status: Dict[TaskStatus, int] = Field(..., description="Number of tasks per status")
+    daily: List[TaskDailyStats] = Field(..., description="Activity per day, oldest first")
+    time_in_status: Dict[TaskStatus, TaskStatusDuration] = Field(
+        ...,
+        description="Average time tasks spent in a status before moving to another one"
+    )
+
+
 class TaskResponse(BaseModel):
     """Schema for task response."""
     
@@ -88,9 +177,16 @@ class TaskListResponse(BaseModel):
     """Schema for task list response with pagination."""
     
     tasks: List[TaskResponse] = Field(..., description="List of tasks")
-    total: int = Field(..., description="Total number of tasks")
+    total: Optional[int] = Field(
+        ...,
+        description="Total number of tasks matching the filter; null when include_total=false"
+    )
     skip: int = Field(..., description="Number of items skipped")
     limit: int = Field(..., description="Number of items returned")
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor for the next page; null when there are no more tasks"
+    )
     
     class Config:
         """Pydantic configuration."""
@@ -109,6 +205,7 @@ class TaskListResponse(BaseModel):
                 ],
                 "total": 1,
                 "skip": 0,
-                "limit": 10
+                "limit": 10,
+                "next_cursor": None
             }
         }
@@ -1,5 +1,5 @@
 """Services package."""
 
-from .task_service import TaskService
+from .task_service import AsyncTaskService, TaskService
 
-__all__ = ["TaskService"]
+__all__ = ["AsyncTaskService", "TaskService"]
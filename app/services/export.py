@@ -0,0 +1,80 @@
+"""Serialization of task rows for bulk export."""
+
+import csv
+import io
+import json
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, Sequence
+
+EXPORT_COLUMNS = ("id", "title", "description", "status", "created_at", "updated_at")
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+EXPORT_MEDIA_TYPES: Dict[ExportFormat, str] = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _values(row: Sequence[Any]) -> tuple:
+    # Straight from the database row, without building a Task: the status
+    # enum becomes its public value and timestamps ISO 8601 strings.
+    task_id, title, description, status, created_at, updated_at = row
+    return task_id, title, description, status.value, created_at.isoformat(), updated_at.isoformat()
+
+
+class _CsvEncoder:
+    def __init__(self) -> None:
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+    
+    def __call__(self, values: Iterable[Any]) -> str:
+        self._writer.writerow(values)
+        line = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return line
+
+
+def _ndjson_line(values: tuple) -> str:
+    return json.dumps(dict(zip(EXPORT_COLUMNS, values)), ensure_ascii=False) + "\n"
+
+
+def _encoder(export_format: ExportFormat) -> tuple[str, Callable[[tuple], str]]:
+    """Return the header and the per-row encoder for a format."""
+    if export_format == ExportFormat.CSV:
+        encode = _CsvEncoder()
+        return encode(EXPORT_COLUMNS), encode
+    return "", _ndjson_line
+
+
+def _encode_batch(batch: Sequence[Sequence[Any]], encode: Callable[[tuple], str]) -> str:
+    return "".join([encode(_values(row)) for row in batch])
+
+
+def encode_rows(
+    batches: Iterable[Sequence[Sequence[Any]]],
+    export_format: ExportFormat
+) -> Iterator[str]:
+    """Encode batches of task rows, one chunk of the export body per batch."""
+    header, encode = _encoder(export_format)
+    if header:
+        yield header
+    for batch in batches:
+        yield _encode_batch(batch, encode)
+
+
+async def aencode_rows(
+    batches: AsyncIterator[Sequence[Sequence[Any]]],
+    export_format: ExportFormat
+) -> AsyncIterator[str]:
+    """Encode batches of task rows from an async stream, one chunk per batch."""
+    header, encode = _encoder(export_format)
+    if header:
+        yield header
+    async for batch in batches:
+        yield _encode_batch(batch, encode)
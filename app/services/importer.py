@@ -0,0 +1,94 @@
+"""Incremental parsing of NDJSON task imports."""
+
+from typing import AsyncIterable, AsyncIterator, Iterator, Tuple, Union
+
+from pydantic import ValidationError
+
+from app.schemas.task_schemas import TaskCreate, TaskImportError, TaskImportResponse
+
+# Tasks committed per transaction by default
+IMPORT_CHUNK_SIZE = 1000
+
+# Longer lines are rejected instead of being buffered without bound
+IMPORT_MAX_LINE_BYTES = 1024 * 1024
+
+# Rejected lines listed in the summary; the rest are only counted
+IMPORT_MAX_ERRORS = 1000
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+        if item["loc"] else item["msg"]
+        for item in error.errors()
+    )
+
+
+class NdjsonTaskReader:
+    """Split an NDJSON body fed in arbitrary pieces and validate each line.
+    
+    Only the current incomplete line is buffered. Blank lines are skipped
+    but still counted, so reported line numbers match the upload.
+    """
+    
+    def __init__(self) -> None:
+        self.line_number = 0
+        self._buffer = bytearray()
+        self._skipping = False
+    
+    def feed(self, data: bytes) -> Iterator[Tuple[int, Union[TaskCreate, str]]]:
+        """Yield (line number, task or error) for every line completed by data."""
+        start = 0
+        while True:
+            end = data.find(b"\n", start)
+            if end == -1:
+                break
+            yield from self._line(data[start:end])
+            start = end + 1
+        
+        if not self._skipping:
+            self._buffer += data[start:]
+            if len(self._buffer) > IMPORT_MAX_LINE_BYTES:
+                # Drop the rest of this line as it arrives
+                self._buffer.clear()
+                self._skipping = True
+    
+    def close(self) -> Iterator[Tuple[int, Union[TaskCreate, str]]]:
+        """Yield the result for a final line without a trailing newline."""
+        if self._buffer or self._skipping:
+            yield from self._line(b"")
+    
+    def _line(self, tail: bytes) -> Iterator[Tuple[int, Union[TaskCreate, str]]]:
+        self.line_number += 1
+        if self._skipping:
+            self._skipping = False
+            yield self.line_number, f"line longer than {IMPORT_MAX_LINE_BYTES} bytes"
+            return
+        
+        line = bytes(self._buffer + tail) if self._buffer else tail
+        self._buffer.clear()
+        if not line.strip():
+            return
+        try:
+            yield self.line_number, TaskCreate.model_validate_json(line)
+        except ValidationError as e:
+            yield self.line_number, _describe(e)
+
+
+async def aread_ndjson(
+    chunks: AsyncIterable[bytes]
+) -> AsyncIterator[Tuple[int, Union[TaskCreate, str]]]:
+    """Yield (line number, task or error) for every line of an async NDJSON stream."""
+    reader = NdjsonTaskReader()
+    async for data in chunks:
+        for item in reader.feed(data):
+            yield item
+    for item in reader.close():
+        yield item
+
+
+def add_import_error(result: TaskImportResponse, line: int, error: str) -> None:
+    """Count a rejected line, listing it while there is room."""
+    result.failed += 1
+    if len(result.errors) < IMPORT_MAX_ERRORS:
+        result.errors.append(TaskImportError(line=line, error=error))
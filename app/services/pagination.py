@@ -0,0 +1,34 @@
+"""Opaque keyset cursors for task list pagination."""
+
+import base64
+import json
+from datetime import datetime
+from typing import Tuple, Union
+from uuid import UUID
+
+from app.models.task import Task
+
+
+def encode_position(created_at: datetime, task_id: Union[UUID, str]) -> str:
+    """Encode a (created_at, id) position as an opaque cursor."""
+    payload = json.dumps([created_at.isoformat(), str(task_id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def encode_cursor(task: Task) -> str:
+    """Encode the (created_at, id) position of a task as an opaque cursor."""
+    return encode_position(task.created_at, task.id)
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), UUID(task_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
@@ -1,66 +1,439 @@
 """Task service with business logic."""
 
-from typing import List, Optional
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 from uuid import UUID
 
-from app.database.storage import task_storage
+from starlette.concurrency import iterate_in_threadpool
+
+from app.database.async_storage import AsyncTaskStorage, ThreadpoolTaskStorage
+from app.database.queries import TASK_FIELDS
+from app.database.backends import task_storage
+from app.database.base import BaseTaskStorage
+from app.database.version import tasks_version
 from app.models.task import Task, TaskStatus
-from app.schemas.task_schemas import TaskCreate, TaskUpdate
+from app.schemas.task_schemas import (
+    TaskCreate,
+    TaskDailyStats,
+    TaskImportResponse,
+    TaskStatsResponse,
+    TaskStatusBulkUpdate,
+    TaskStatusDuration,
+    TaskUpdate,
+)
+from app.services.cache import task_cache, task_list_cache
+from app.services.export import ExportFormat, aencode_rows, encode_rows
+from app.services.importer import IMPORT_CHUNK_SIZE, add_import_error, aread_ndjson
+from app.services.pagination import decode_cursor
 
 
-class TaskService:
-    """Service for task operations."""
+def _build_task(task_data: TaskCreate) -> Task:
+    """Build a new task from creation data."""
+    return Task(
+        title=task_data.title,
+        description=task_data.description,
+        status=task_data.status or TaskStatus.CREATED
+    )
+
+
+def _update_changes(task_data: TaskUpdate) -> Dict[str, Any]:
+    """Return the fields an update actually sets."""
+    # Only write the fields that were sent; explicit nulls keep the
+    # stored value since every column is required.
+    return {
+        field: value
+        for field, value in task_data.model_dump(exclude_unset=True).items()
+        if value is not None
+    }
+
+
+def _invalidate_status_update(update_data: TaskStatusBulkUpdate) -> None:
+    """Drop cached tasks a bulk status update may have changed."""
+    if update_data.ids is not None:
+        for task_id in update_data.ids:
+            task_cache.delete(task_id)
+    else:
+        # Selected by filter: the affected ids are unknown
+        task_cache.clear()
+
+
+def _list_key(
+    status: Optional[TaskStatus],
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    include_total: bool
+) -> Tuple[Any, ...]:
+    """Key a list page by the query and the write version it was read at."""
+    # Taken before reading: a write committing mid-read bumps the version,
+    # so the page cannot outlive it.
+    return (tasks_version.value, status, skip, limit, cursor, include_total)
+
+
+def _page_fields(fields: Sequence[str]) -> Tuple[str, ...]:
+    """Requested fields plus the (created_at, id) a next cursor is built from."""
+    wanted = set(fields) | {"id", "created_at"}
+    return tuple(name for name in TASK_FIELDS if name in wanted)
+
+
+def _project(task: Task, fields: Sequence[str]) -> Dict[str, Any]:
+    """Take only the given fields of a task."""
+    return {name: getattr(task, name) for name in fields}
+
+
+def _stats_since(days: int) -> date:
+    """First UTC day of a window of days ending today."""
+    return datetime.utcnow().date() - timedelta(days=days - 1)
+
+
+def _build_stats(rollups: Dict[str, Any]) -> TaskStatsResponse:
+    """Shape the storage rollups into the stats response."""
+    by_status = {status: rollups["by_status"].get(status, 0) for status in TaskStatus}
+    return TaskStatsResponse(
+        total=sum(by_status.values()),
+        by_status=by_status,
+        daily=[
+            TaskDailyStats(day=day, created=created, completed=completed)
+            for day, created, completed in rollups["daily"]
+        ],
+        time_in_status={
+            status: TaskStatusDuration(
+                average_seconds=total_seconds / count,
+                transitions=count
+            )
+            for status, (total_seconds, count) in rollups["durations"].items()
+            if count
+        }
+    )
+
+
+def _to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Convert an aware timestamp to the naive UTC form stored in the database."""
+    if value and value.tzinfo:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class AsyncTaskService:
+    """Service for task operations, used by the API handlers.
+    
+    Works over an AsyncTaskStorage, or over a sync TaskStorage wrapped in
+    ThreadpoolTaskStorage, depending on the configured backend. TaskService
+    runs the same methods synchronously.
+    """
     
-    def __init__(self) -> None:
+    def __init__(self, storage: Union[AsyncTaskStorage, ThreadpoolTaskStorage]) -> None:
         """Initialize service."""
-        self.storage = task_storage
+        self.storage = storage
     
-    def create_task(self, task_data: TaskCreate) -> Task:
+    async def create_task(self, task_data: TaskCreate) -> Task:
         """Create a new task."""
-        task = Task(
-            title=task_data.title,
-            description=task_data.description,
-            status=task_data.status or TaskStatus.CREATED
+        return await self.storage.create_task(_build_task(task_data))
+    
+    async def create_tasks(self, tasks_data: List[TaskCreate]) -> List[Task]:
+        """Create several tasks in a single transaction."""
+        return await self.storage.create_tasks(
+            [_build_task(task_data) for task_data in tasks_data]
         )
-        return self.storage.create_task(task)
     
-    def get_task(self, task_id: UUID) -> Optional[Task]:
-        """Get task by ID."""
-        return self.storage.get_task(task_id)
+    async def import_tasks(
+        self,
+        chunks: AsyncIterable[bytes],
+        chunk_size: int = IMPORT_CHUNK_SIZE
+    ) -> TaskImportResponse:
+        """Create tasks from an NDJSON byte stream, committing every chunk_size tasks.
+        
+        Invalid lines are reported in the result and do not stop the import.
+        """
+        result = TaskImportResponse()
+        pending: List[TaskCreate] = []
+        async for line, item in aread_ndjson(chunks):
+            if isinstance(item, str):
+                add_import_error(result, line, item)
+                continue
+            pending.append(item)
+            if len(pending) >= chunk_size:
+                result.imported += len(await self.create_tasks(pending))
+                pending = []
+        if pending:
+            result.imported += len(await self.create_tasks(pending))
+        return result
     
-    def get_tasks(
+    async def get_task(self, task_id: UUID) -> Optional[Task]:
+        """Get task by ID, served from the task cache when possible."""
+        task = task_cache.get(task_id)
+        if task is None:
+            # Like _list_key: a write committing mid-read bumps the version,
+            # and its invalidation may already have run, so the possibly
+            # stale task read here is not cached.
+            version = tasks_version.value
+            task = await self.storage.get_task(task_id)
+            if task is not None and tasks_version.value == version:
+                task_cache.set(task_id, task)
+        return task
+    
+    async def get_tasks(
+        self,
+        status: Optional[TaskStatus] = None,
+        skip: int = 0,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> tuple[List[Task], Optional[int]]:
+        """Get list of tasks with optional filtering and pagination.
+        
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        key = _list_key(status, skip, limit, cursor, include_total)
+        page = task_list_cache.get(key)
+        if page is None:
+            after = decode_cursor(cursor) if cursor else None
+            page = await self.storage.get_tasks(
+                status=status,
+                skip=skip,
+                limit=limit,
+                after=after,
+                include_total=include_total
+            )
+            task_list_cache.set(key, page)
+        return page
+    
+    async def get_partial_task(self, task_id: UUID, fields: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """Get only the given fields of a task, reading just those columns."""
+        task = task_cache.get(task_id)
+        if task is not None:
+            return _project(task, fields)
+        return await self.storage.get_task_row(task_id, fields)
+    
+    async def get_partial_tasks(
         self,
+        fields: Sequence[str],
+        status: Optional[TaskStatus] = None,
+        skip: int = 0,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> tuple[List[Dict[str, Any]], Optional[int]]:
+        """Get a page of tasks with only the given fields, reading just those columns.
+        
+        Rows also carry created_at and id, which the next cursor is built
+        from, even when they were not requested.
+        
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        key = _list_key(status, skip, limit, cursor, include_total) + (tuple(fields),)
+        page = task_list_cache.get(key)
+        if page is None:
+            after = decode_cursor(cursor) if cursor else None
+            page = await self.storage.get_task_rows(
+                _page_fields(fields),
+                status=status,
+                skip=skip,
+                limit=limit,
+                after=after,
+                include_total=include_total
+            )
+            task_list_cache.set(key, page)
+        return page
+    
+    async def search_tasks(
+        self,
+        query: str,
         status: Optional[TaskStatus] = None,
         skip: int = 0,
         limit: int = 10
     ) -> tuple[List[Task], int]:
-        """Get list of tasks with optional filtering and pagination."""
-        return self.storage.get_tasks(status=status, skip=skip, limit=limit)
+        """Full-text search over title and description, best match first."""
+        return await self.storage.search_tasks(query, status=status, skip=skip, limit=limit)
     
-    def update_task(self, task_id: UUID, task_data: TaskUpdate) -> Optional[Task]:
+    def export_tasks(
+        self,
+        export_format: ExportFormat,
+        status: Optional[TaskStatus] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None
+    ) -> AsyncIterator[str]:
+        """Stream every selected task, oldest first, encoded in chunks."""
+        rows = self.storage.export_tasks(
+            status=status,
+            created_after=_to_naive_utc(created_after),
+            created_before=_to_naive_utc(created_before)
+        )
+        return aencode_rows(rows, export_format)
+    
+    async def get_stats(self, days: int = 30) -> TaskStatsResponse:
+        """Get task statistics from the rollups, with activity for the last days."""
+        return _build_stats(await self.storage.get_stats(_stats_since(days)))
+    
+    async def update_task(self, task_id: UUID, task_data: TaskUpdate) -> Optional[Task]:
         """Update an existing task."""
-        existing_task = self.storage.get_task(task_id)
-        if not existing_task:
-            return None
+        changes = _update_changes(task_data)
+        if not changes:
+            return await self.get_task(task_id)
         
-        # Create updated task with new data
-        update_data = task_data.model_dump(exclude_unset=True)
+        task = await self.storage.update_task(task_id, changes)
+        task_cache.delete(task_id)
+        return task
+    
+    async def update_tasks_status(self, update_data: TaskStatusBulkUpdate) -> int:
+        """Move every selected task to a new status and return how many changed."""
+        updated = await self.storage.update_tasks_status(
+            status=update_data.status,
+            ids=update_data.ids,
+            current_status=update_data.current_status,
+            created_before=_to_naive_utc(update_data.created_before)
+        )
+        _invalidate_status_update(update_data)
+        return updated
+    
+    async def delete_task(self, task_id: UUID) -> bool:
+        """Delete a task."""
+        deleted = await self.storage.delete_task(task_id)
+        task_cache.delete(task_id)
+        return deleted
+    
+    async def task_exists(self, task_id: UUID) -> bool:
+        """Check if task exists."""
+        return await self.get_task(task_id) is not None
+
+
+class TaskService:
+    """Synchronous facade over AsyncTaskService, for scripts and tests.
+    
+    Each call runs the AsyncTaskService method to completion in its own
+    event loop, with the storage calls in the threadpool, so the logic
+    lives in one place. Not for use inside a running event loop; use
+    AsyncTaskService there.
+    """
+    
+    def __init__(self, storage: Optional[BaseTaskStorage] = None) -> None:
+        """Initialize service.
         
-        # Preserve original values for fields not being updated
-        updated_task = existing_task.model_copy(deep=True)
+        Without an explicit storage the one chosen by STORAGE_BACKEND is
+        used.
+        """
+        self.storage = storage or task_storage
+        self._service = AsyncTaskService(ThreadpoolTaskStorage(self.storage))
+    
+    def create_task(self, task_data: TaskCreate) -> Task:
+        """Create a new task."""
+        return asyncio.run(self._service.create_task(task_data))
+    
+    def create_tasks(self, tasks_data: List[TaskCreate]) -> List[Task]:
+        """Create several tasks in a single transaction."""
+        return asyncio.run(self._service.create_tasks(tasks_data))
+    
+    def import_tasks(
+        self,
+        chunks: Iterable[bytes],
+        chunk_size: int = IMPORT_CHUNK_SIZE
+    ) -> TaskImportResponse:
+        """Create tasks from an NDJSON byte stream, committing every chunk_size tasks."""
+        return asyncio.run(
+            self._service.import_tasks(iterate_in_threadpool(iter(chunks)), chunk_size)
+        )
+    
+    def get_task(self, task_id: UUID) -> Optional[Task]:
+        """Get task by ID, served from the task cache when possible."""
+        return asyncio.run(self._service.get_task(task_id))
+    
+    def get_tasks(
+        self,
+        status: Optional[TaskStatus] = None,
+        skip: int = 0,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> tuple[List[Task], Optional[int]]:
+        """Get list of tasks with optional filtering and pagination.
         
-        for field, value in update_data.items():
-            setattr(updated_task, field, value)
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        return asyncio.run(self._service.get_tasks(status, skip, limit, cursor, include_total))
+    
+    def get_partial_task(self, task_id: UUID, fields: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """Get only the given fields of a task, reading just those columns."""
+        return asyncio.run(self._service.get_partial_task(task_id, fields))
+    
+    def get_partial_tasks(
+        self,
+        fields: Sequence[str],
+        status: Optional[TaskStatus] = None,
+        skip: int = 0,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> tuple[List[Dict[str, Any]], Optional[int]]:
+        """Get a page of tasks with only the given fields, reading just those columns.
         
-        return self.storage.update_task(task_id, updated_task)
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        return asyncio.run(
+            self._service.get_partial_tasks(fields, status, skip, limit, cursor, include_total)
+        )
+    
+    def search_tasks(
+        self,
+        query: str,
+        status: Optional[TaskStatus] = None,
+        skip: int = 0,
+        limit: int = 10
+    ) -> tuple[List[Task], int]:
+        """Full-text search over title and description, best match first."""
+        return asyncio.run(self._service.search_tasks(query, status, skip, limit))
+    
+    def export_tasks(
+        self,
+        export_format: ExportFormat,
+        status: Optional[TaskStatus] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None
+    ) -> Iterator[str]:
+        """Stream every selected task, oldest first, encoded in chunks."""
+        # A stream outlives any single event loop: read the sync storage directly
+        batches = self.storage.export_tasks(
+            status=status,
+            created_after=_to_naive_utc(created_after),
+            created_before=_to_naive_utc(created_before)
+        )
+        return encode_rows(batches, export_format)
+    
+    def get_stats(self, days: int = 30) -> TaskStatsResponse:
+        """Get task statistics from the rollups, with activity for the last days."""
+        return asyncio.run(self._service.get_stats(days))
+    
+    def update_task(self, task_id: UUID, task_data: TaskUpdate) -> Optional[Task]:
+        """Update an existing task."""
+        return asyncio.run(self._service.update_task(task_id, task_data))
+    
+    def update_tasks_status(self, update_data: TaskStatusBulkUpdate) -> int:
+        """Move every selected task to a new status and return how many changed."""
+        return asyncio.run(self._service.update_tasks_status(update_data))
     
     def delete_task(self, task_id: UUID) -> bool:
         """Delete a task."""
-        return self.storage.delete_task(task_id)
+        return asyncio.run(self._service.delete_task(task_id))
     
     def task_exists(self, task_id: UUID) -> bool:
         """Check if task exists."""
-        return self.storage.get_task(task_id) is not None
+        return asyncio.run(self._service.task_exists(task_id))
 
 
 # Global service instance
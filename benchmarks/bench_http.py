@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""Load-test every /api/v1/tasks endpoint through the ASGI app.
+
+Seeds a scratch database to each dataset size, then has concurrent
+clients drive a weighted mix of requests in-process (httpx over
+ASGITransport, no network) and reports latency percentiles and throughput
+per endpoint:
+
+    python -m benchmarks.bench_http --tasks 1000 10000 --concurrency 16 \\
+        --requests 5000 --save baseline.json
+
+A later run compared against the saved baseline exits with status 1 if an
+endpoint's p95 latency, or the run's overall throughput, got worse by more
+than the threshold. The baseline must come from a run with the same mix,
+concurrency, backend and cache setting:
+
+    python -m benchmarks.bench_http --tasks 1000 10000 --baseline baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import time
+from pathlib import Path
+
+DB_NAME = "bench_http.db"
+
+SEED_BATCH = 5000
+
+# Relative weight of each operation in the default mix
+DEFAULT_MIX = {
+    "create": 10,
+    "bulk": 1,
+    "get": 30,
+    "get_fields": 5,
+    "list": 15,
+    "list_status": 10,
+    "list_cursor": 5,
+    "search": 5,
+    "stats": 2,
+    "export": 1,
+    "import": 1,
+    "update": 10,
+    "status": 2,
+    "delete": 3,
+}
+
+STATUSES = ["создано", "в работе", "завершено"]
+
+WORDS = ["отчет", "встреча", "релиз", "review", "deploy", "backlog", "план", "release"]
+
+
+def percentile(values, fraction):
+    """Return the value at the given fraction of the sorted values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def parse_mix(text):
+    """Parse "get=30,list=10" into operation weights."""
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() not in DEFAULT_MIX:
+            raise SystemExit(f"unknown operation: {name.strip()}")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def task_payload(i):
+    """Build a task creation payload."""
+    return {
+        "title": f"{random.choice(WORDS)} {i}",
+        "description": " ".join(random.choices(WORDS, k=8)),
+        "status": random.choice(STATUSES),
+    }
+
+
+class Workload:
+    """The request mix, over the ids of tasks known to exist."""
+
+    def __init__(self, client, ids):
+        self.client = client
+        self.ids = ids
+        self.created = 0
+
+    def task_id(self):
+        return random.choice(self.ids)
+
+    async def create(self):
+        self.created += 1
+        response = await self.client.post("/api/v1/tasks/", json=task_payload(self.created))
+        if response.status_code == 201:
+            self.ids.append(response.json()["id"])
+        return response, 201
+
+    async def bulk(self):
+        payload = [task_payload(i) for i in range(20)]
+        response = await self.client.post("/api/v1/tasks/bulk", json=payload)
+        if response.status_code == 201:
+            self.ids.extend(task["id"] for task in response.json())
+        return response, 201
+
+    async def get(self):
+        return await self.client.get(f"/api/v1/tasks/{self.task_id()}"), 200
+
+    async def get_fields(self):
+        response = await self.client.get(
+            f"/api/v1/tasks/{self.task_id()}", params={"fields": "id,title,status"}
+        )
+        return response, 200
+
+    async def list(self):
+        params = {"skip": random.choice([0, 0, 0, 100, 1000]), "limit": 20}
+        return await self.client.get("/api/v1/tasks/", params=params), 200
+
+    async def list_status(self):
+        params = {"status": random.choice(STATUSES), "limit": 20}
+        return await self.client.get("/api/v1/tasks/", params=params), 200
+
+    async def list_cursor(self):
+        first = await self.client.get("/api/v1/tasks/", params={"limit": 20})
+        cursor = first.json().get("next_cursor")
+        if not cursor:
+            return first, 200
+        params = {"cursor": cursor, "limit": 20}
+        return await self.client.get("/api/v1/tasks/", params=params), 200
+
+    async def search(self):
+        params = {"q": random.choice(WORDS)[:4], "limit": 20}
+        return await self.client.get("/api/v1/tasks/search", params=params), 200
+
+    async def stats(self):
+        return await self.client.get("/api/v1/tasks/stats"), 200
+
+    async def export(self):
+        params = {"format": "ndjson", "status": random.choice(STATUSES)}
+        response = await self.client.get("/api/v1/tasks/export", params=params)
+        return response, 200
+
+    async def import_(self):
+        body = "\n".join(json.dumps(task_payload(i)) for i in range(20))
+        response = await self.client.post(
+            "/api/v1/tasks/import",
+            content=body.encode(),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        return response, 200
+
+    async def update(self):
+        changes = random.choice([
+            {"title": "Renamed"},
+            {"status": random.choice(STATUSES)},
+            {"description": "Changed", "status": random.choice(STATUSES)},
+        ])
+        return await self.client.put(f"/api/v1/tasks/{self.task_id()}", json=changes), 200
+
+    async def status(self):
+        payload = {"ids": random.sample(self.ids, 10), "status": random.choice(STATUSES)}
+        return await self.client.patch("/api/v1/tasks/status", json=payload), 200
+
+    async def delete(self):
+        # Keep the dataset from draining; the last ids are never deleted
+        task_id = self.ids.pop(random.randrange(len(self.ids))) if len(self.ids) > 100 else None
+        if task_id is None:
+            return await self.get()
+        return await self.client.delete(f"/api/v1/tasks/{task_id}"), 204
+
+    def operation(self, name):
+        return getattr(self, "import_" if name == "import" else name)
+
+
+async def seed(client, ids, size):
+    """Bulk-create tasks until the dataset has the given size."""
+    while len(ids) < size:
+        count = min(SEED_BATCH, size - len(ids))
+        response = await client.post(
+            "/api/v1/tasks/bulk", json=[task_payload(len(ids) + i) for i in range(count)]
+        )
+        assert response.status_code == 201, response.text
+        ids.extend(task["id"] for task in response.json())
+
+
+async def run_mix(workload, mix, requests, concurrency):
+    """Issue the requests from concurrent workers and time each one."""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    plan = random.choices(names, weights=weights, k=requests)
+    latencies = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+
+    async def worker(queue):
+        while queue:
+            name = queue.pop()
+            started = time.perf_counter()
+            response, expected = await workload.operation(name)()
+            latencies[name].append((time.perf_counter() - started) * 1000)
+            if response.status_code != expected:
+                errors[name] += 1
+
+    queue = plan[::-1]
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(queue) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    results = {}
+    for name in names:
+        values = latencies[name]
+        if not values:
+            continue
+        results[name] = {
+            "requests": len(values),
+            "errors": errors[name],
+            "p50_ms": round(percentile(values, 0.50), 3),
+            "p95_ms": round(percentile(values, 0.95), 3),
+            "p99_ms": round(percentile(values, 0.99), 3),
+        }
+    return results, elapsed
+
+
+async def run(args, mix):
+    """Seed each dataset size and run the mix against it."""
+    import httpx
+
+    from app.database.connection import engine
+    from app.database.models import Base
+    from app.main import app
+
+    Base.metadata.create_all(bind=engine)
+    transport = httpx.ASGITransport(app=app)
+    sizes = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        ids = []
+        for size in sorted(args.tasks):
+            await seed(client, ids, size)
+            workload = Workload(client, ids)
+            # Warm up caches and connection pools before measuring
+            await run_mix(workload, mix, min(args.requests // 10, 500), args.concurrency)
+            results, elapsed = await run_mix(workload, mix, args.requests, args.concurrency)
+            # Endpoints share the run, so throughput is only meaningful overall
+            sizes[str(size)] = {
+                "requests_per_s": round(args.requests / elapsed, 1),
+                "endpoints": results,
+            }
+            print_results(size, results, elapsed, args.requests)
+    return sizes
+
+
+def print_results(size, results, elapsed, requests):
+    """Print one dataset size's results as a table."""
+    print(f"\n{size} tasks: {requests} requests in {elapsed:.2f} s ({requests / elapsed:.0f} requests/s)")
+    print(f"  {'endpoint':<12} {'requests':>8} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, stats in results.items():
+        print(
+            f"  {name:<12} {stats['requests']:>8} {stats['errors']:>6} {stats['p50_ms']:>9.3f}"
+            f" {stats['p95_ms']:>9.3f} {stats['p99_ms']:>9.3f}"
+        )
+
+
+# Run settings a baseline must share for its numbers to be comparable
+COMPARED_SETTINGS = ("mix", "concurrency", "backend", "cache")
+
+
+def setting_mismatches(baseline, report):
+    """Return the run settings that differ between a baseline and this run."""
+    return [
+        f"{name}: baseline {baseline.get(name)!r}, this run {report[name]!r}"
+        for name in COMPARED_SETTINGS
+        if baseline.get(name) != report[name]
+    ]
+
+
+def compare(baseline, sizes, threshold):
+    """Return the regressions of a run against a baseline."""
+    regressions = []
+    for size, run in sizes.items():
+        previous = baseline["sizes"].get(size)
+        if not previous:
+            continue
+        if run["requests_per_s"] < previous["requests_per_s"] * (1 - threshold):
+            regressions.append(
+                f"{size} tasks: {previous['requests_per_s']:.1f} -> "
+                f"{run['requests_per_s']:.1f} requests/s"
+            )
+        for name, stats in run["endpoints"].items():
+            before = previous["endpoints"].get(name)
+            if before and stats["p95_ms"] > before["p95_ms"] * (1 + threshold):
+                regressions.append(
+                    f"{size} tasks, {name}: p95 {before['p95_ms']:.3f} -> {stats['p95_ms']:.3f} ms"
+                )
+    return regressions
+
+
+def main():
+    """Run the benchmark, save or compare the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1000, 10000], help="dataset sizes to seed")
+    parser.add_argument("--requests", type=int, default=5000, help="measured requests per dataset size")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--mix", type=parse_mix, help="operation weights, e.g. get=30,list=10,create=5")
+    parser.add_argument("--backend", choices=["sync", "async", "memory"], help="STORAGE_BACKEND to run on")
+    parser.add_argument("--no-cache", action="store_true", help="disable the task and list caches")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the request mix")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved by --save")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed regression, as a fraction")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    mix = args.mix or DEFAULT_MIX
+
+    # Settings are read at import time
+    os.environ["DB_NAME"] = DB_NAME
+    if args.backend:
+        os.environ["STORAGE_BACKEND"] = args.backend
+    if args.no_cache:
+        os.environ["TASK_CACHE_SIZE"] = "0"
+        os.environ["TASK_LIST_CACHE_SIZE"] = "0"
+    report = {
+        "backend": os.getenv("STORAGE_BACKEND", "sync"),
+        "cache": not args.no_cache,
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "mix": mix,
+        "python": platform.python_version(),
+    }
+
+    # Refuse before spending minutes on a run that cannot be compared
+    baseline = json.loads(Path(args.baseline).read_text()) if args.baseline else None
+    mismatches = setting_mismatches(baseline, report) if baseline else []
+    if mismatches:
+        print(f"Not comparable with {args.baseline}, the run settings differ:")
+        for line in mismatches:
+            print(f"  {line}")
+        raise SystemExit(2)
+
+    Path(DB_NAME).unlink(missing_ok=True)
+    try:
+        sizes = asyncio.run(run(args, mix))
+    finally:
+        from app.database.connection import engine
+
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            Path(DB_NAME + suffix).unlink(missing_ok=True)
+
+    report["sizes"] = sizes
+    if args.save:
+        Path(args.save).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+        print(f"\nResults saved to {args.save}")
+    if baseline:
+        regressions = compare(baseline, sizes, args.threshold)
+        if regressions:
+            print(f"\nRegressions over {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            raise SystemExit(1)
+        print(f"\nNo regressions over {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
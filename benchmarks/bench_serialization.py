@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Benchmark per-row cost of rendering a task list page as JSON.
+
+Compares the pydantic response path (TaskResponse per row, then FastAPI's
+response_model validation and jsonable_encoder) with the orjson path used
+by the read endpoints, for pages built from database-shaped rows:
+
+    python -m benchmarks.bench_serialization --rows 100 --pages 2000
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.api.responses import task_list_response
+from app.database import queries
+from app.database.models import TaskStatusEnum
+from app.schemas.task_schemas import TaskListResponse, TaskResponse
+
+
+def make_rows(count):
+    """Build rows shaped like a page read from the tasks table."""
+    now = datetime.utcnow()
+    return [
+        {
+            "id": str(uuid4()),
+            "title": f"Task {i}",
+            "description": "Прочитать документацию и создать тестовое приложение " * 4,
+            "status": list(TaskStatusEnum)[i % 3],
+            "created_at": now - timedelta(seconds=i),
+            "updated_at": now - timedelta(seconds=i),
+        }
+        for i in range(count)
+    ]
+
+
+async def render_pydantic(field, tasks):
+    """Render a page the way a response_model endpoint does."""
+    page = TaskListResponse(
+        tasks=[TaskResponse.model_validate(task) for task in tasks],
+        total=len(tasks),
+        skip=0,
+        limit=len(tasks),
+    )
+    content = await serialize_response(field=field, response_content=page, is_coroutine=True)
+    return JSONResponse(content).body
+
+
+def render_orjson(tasks):
+    """Render a page with the orjson read path."""
+    return task_list_response(tasks, len(tasks), 0, len(tasks)).body
+
+
+def per_row_us(func, pages, rows):
+    """Run func for the given number of pages and return microseconds per row."""
+    started = time.perf_counter()
+    for _ in range(pages):
+        func()
+    return (time.perf_counter() - started) / (pages * rows) * 1_000_000
+
+
+def main():
+    """Run the benchmark and print per-row costs."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100, help="rows per page")
+    parser.add_argument("--pages", type=int, default=2000, help="pages rendered per path")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    tasks = [queries.row_to_task(row) for row in rows]
+    field = create_response_field(name="response", type_=TaskListResponse)
+    loop = asyncio.new_event_loop()
+
+    def pydantic_page():
+        return loop.run_until_complete(render_pydantic(field, tasks))
+
+    def orjson_page():
+        return render_orjson(tasks)
+
+    def convert_rows():
+        return [queries.row_to_task(row) for row in rows]
+
+    # Same document either way
+    assert TaskListResponse.model_validate_json(pydantic_page()) == \
+        TaskListResponse.model_validate_json(orjson_page())
+
+    convert = per_row_us(convert_rows, args.pages, args.rows)
+    before = per_row_us(pydantic_page, args.pages, args.rows)
+    after = per_row_us(orjson_page, args.pages, args.rows)
+    loop.close()
+
+    print(f"{args.rows}-row pages, {args.pages} pages per path")
+    print(f"  row -> Task              {convert:7.2f} us/row")
+    print(f"  Task -> JSON, pydantic   {before:7.2f} us/row")
+    print(f"  Task -> JSON, orjson     {after:7.2f} us/row")
+    print(f"  row -> JSON before       {convert + before:7.2f} us/row")
+    print(f"  row -> JSON after        {convert + after:7.2f} us/row")
+    print(f"  speedup                  {(convert + before) / (convert + after):7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""Benchmark how task storage operations scale with the table size.
+
+Calls the storage directly, without HTTP, services or caches. The table
+is grown through each size in turn, and every operation is timed at each
+size. The report shows how much an operation's latency grows as the table
+grows (the exponent k in time ~ rows^k), so calls that degrade
+super-linearly stand out:
+
+    python -m benchmarks.bench_storage --sizes 1000 10000 100000 1000000
+    python -m benchmarks.bench_storage --sizes 1000000 10000000 --db big.db
+
+With --db the database is kept and reused, so a large table only has to
+be built once (or generated with generate_tasks.py).
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+DB_NAME = "bench_storage.db"
+
+SEED_BATCH = 50000
+
+# Time spent per operation and size; slow calls stop early, fast ones
+# stop at --repeat.
+TIME_BUDGET_S = 2.0
+MIN_REPEAT = 3
+
+STATUS_NAMES = ["CREATED", "IN_PROGRESS", "COMPLETED"]
+
+
+def percentile(values, fraction):
+    """Return the value at the given fraction of the sorted values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def seed_sqlite(engine, start, stop, now):
+    """Insert rows directly with executemany, in one transaction per batch."""
+    from app.database import queries
+    from app.database.models import TaskStatusEnum
+
+    for batch_start in range(start, stop, SEED_BATCH):
+        rows = []
+        for i in range(batch_start, min(batch_start + SEED_BATCH, stop)):
+            created_at = now - timedelta(seconds=i)
+            rows.append({
+                "id": str(uuid4()),
+                "title": f"Task {i}",
+                "description": f"Task {i} description",
+                "status": TaskStatusEnum[STATUS_NAMES[i % 3]],
+                "created_at": created_at,
+                "updated_at": created_at,
+                "status_changed_at": created_at,
+            })
+        with engine.begin() as connection:
+            connection.execute(queries.insert_tasks(), rows)
+
+
+def seed_memory(storage, start, stop, now):
+    """Create tasks through the memory storage, one batch at a time."""
+    from app.models.task import Task, TaskStatus
+
+    statuses = list(TaskStatus)
+    for batch_start in range(start, stop, SEED_BATCH):
+        storage.create_tasks([
+            Task(
+                title=f"Task {i}",
+                description=f"Task {i} description",
+                status=statuses[i % 3],
+                created_at=now - timedelta(seconds=i),
+                updated_at=now - timedelta(seconds=i),
+            )
+            for i in range(batch_start, min(batch_start + SEED_BATCH, stop))
+        ])
+
+
+def sample_ids(storage, size, count):
+    """Pick ids spread over the list order."""
+    positions = sorted(random.randrange(size) for _ in range(count))
+    ids = []
+    for position in positions:
+        tasks, _ = storage.get_tasks(skip=position, limit=1, include_total=False)
+        ids.append(tasks[0].id)
+    return ids
+
+
+def operations(storage, size, ids):
+    """Build the timed calls for one table size: name -> zero-argument callable."""
+    from app.models.task import Task, TaskStatus
+
+    middle = storage.get_tasks(skip=size // 2, limit=1, include_total=False)[0][0]
+    created = []
+
+    def create_task():
+        created.append(storage.create_task(Task(title="Created", description="Benchmark task")).id)
+
+    def delete_task():
+        # Deletes the tasks create_task added, so the size stays put
+        if created:
+            storage.delete_task(created.pop())
+        else:
+            storage.delete_task(uuid4())
+
+    return {
+        "create_task": create_task,
+        "get_task": lambda: storage.get_task(random.choice(ids)),
+        "get_tasks": lambda: storage.get_tasks(limit=20),
+        "get_tasks_no_total": lambda: storage.get_tasks(limit=20, include_total=False),
+        "get_tasks_status": lambda: storage.get_tasks(status=TaskStatus.COMPLETED, limit=20),
+        "get_tasks_offset_mid": lambda: storage.get_tasks(skip=size // 2, limit=20),
+        "get_tasks_offset_end": lambda: storage.get_tasks(skip=max(size - 20, 0), limit=20),
+        "get_tasks_cursor_mid": lambda: storage.get_tasks(
+            limit=20, after=(middle.created_at, middle.id)
+        ),
+        "update_task": lambda: storage.update_task(
+            random.choice(ids), {"status": random.choice(list(TaskStatus))}
+        ),
+        "delete_task": delete_task,
+        "count": storage.count,
+    }
+
+
+def time_call(call, repeat):
+    """Time a call until the repeat count or the time budget runs out."""
+    timings = []
+    deadline = time.perf_counter() + TIME_BUDGET_S
+    while len(timings) < repeat and (len(timings) < MIN_REPEAT or time.perf_counter() < deadline):
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1e6)
+    return {
+        "calls": len(timings),
+        "mean_us": round(statistics.mean(timings), 1),
+        "p50_us": round(percentile(timings, 0.50), 1),
+        "p95_us": round(percentile(timings, 0.95), 1),
+    }
+
+
+def scaling_exponent(sizes, results, name):
+    """Least-squares slope of log(p50) over log(rows) across the sizes."""
+    if len(sizes) < 2:
+        return None
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(results[str(size)][name]["p50_us"], 0.1)) for size in sizes]
+    mean_x, mean_y = statistics.mean(xs), statistics.mean(ys)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    return covariance / sum((x - mean_x) ** 2 for x in xs)
+
+
+def print_report(sizes, results, flag):
+    """Print p50 per operation and size, and the scaling exponent."""
+    names = list(results[str(sizes[0])])
+    header = "".join(f"{size:>12}" for size in sizes)
+    print(f"\np50 latency, µs, by table size\n  {'operation':<22}{header}  {'k':>6}")
+    for name in names:
+        cells = "".join(f"{results[str(size)][name]['p50_us']:>12.1f}" for size in sizes)
+        exponent = scaling_exponent(sizes, results, name)
+        mark = ""
+        if exponent is not None and exponent > 1.1:
+            mark = "  super-linear"
+        elif exponent is not None and exponent > flag:
+            mark = "  grows with table"
+        shown = f"{exponent:>6.2f}" if exponent is not None else f"{'-':>6}"
+        print(f"  {name:<22}{cells}  {shown}{mark}")
+    print("\nk: fitted exponent of time ~ rows^k (0 constant, 1 linear)")
+
+
+def main():
+    """Grow the table through each size and time every operation."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000], help="table sizes"
+    )
+    parser.add_argument("--repeat", type=int, default=500, help="maximum calls per operation and size")
+    parser.add_argument("--backend", choices=["sqlite", "memory"], default="sqlite", help="storage to measure")
+    parser.add_argument("--db", help="keep the SQLite database in this file and reuse it")
+    parser.add_argument("--flag", type=float, default=0.5, help="exponent above which an operation is flagged")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    sizes = sorted(args.sizes)
+
+    # The database location is read at import time
+    db_name = args.db or DB_NAME
+    os.environ["DB_NAME"] = db_name
+    if not args.db:
+        Path(db_name).unlink(missing_ok=True)
+
+    from app.database.connection import engine
+    from app.database.memory_storage import InMemoryTaskStorage
+    from app.database.models import Base
+    from app.database.storage import TaskStorage
+
+    if args.backend == "memory":
+        storage = InMemoryTaskStorage()
+    else:
+        Base.metadata.create_all(bind=engine)
+        storage = TaskStorage()
+
+    now = datetime.utcnow()
+    results = {}
+    try:
+        for size in sizes:
+            existing = storage.count()
+            if existing < size:
+                started = time.perf_counter()
+                if args.backend == "memory":
+                    seed_memory(storage, existing, size, now)
+                else:
+                    seed_sqlite(engine, existing, size, now)
+                print(f"seeded {size - existing} tasks in {time.perf_counter() - started:.1f} s")
+            # Offsets and totals below assume the table has exactly this size
+            size = storage.count()
+            ids = sample_ids(storage, size, 50)
+            results[str(size)] = {
+                name: time_call(call, args.repeat)
+                for name, call in operations(storage, size, ids).items()
+            }
+            print(f"measured {size} tasks")
+        sizes = [int(size) for size in results]
+        print_report(sizes, results, args.flag)
+    finally:
+        engine.dispose()
+        if not args.db:
+            for suffix in ("", "-wal", "-shm"):
+                Path(db_name + suffix).unlink(missing_ok=True)
+
+    if args.save:
+        report = {"backend": args.backend, "sizes": results}
+        Path(args.save).write_text(json.dumps(report, indent=2))
+        print(f"\nResults saved to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
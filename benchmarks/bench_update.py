@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Benchmark PUT /api/v1/tasks/{task_id} latency.
+
+Seeds a scratch SQLite database and times partial updates through the
+API, so the update path can be compared before and after a change:
+
+    python -m benchmarks.bench_update --tasks 1000 --requests 2000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+from pathlib import Path
+
+DB_NAME = "bench_update.db"
+
+
+def percentile(values, fraction):
+    """Return the value at the given fraction of the sorted values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    """Run the benchmark and print latency statistics."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1000, help="number of tasks to seed")
+    parser.add_argument("--requests", type=int, default=2000, help="number of PUT requests")
+    args = parser.parse_args()
+
+    # The database location is read at import time
+    os.environ["DB_NAME"] = DB_NAME
+    Path(DB_NAME).unlink(missing_ok=True)
+
+    from fastapi.testclient import TestClient
+
+    from app.database.connection import engine
+    from app.database.models import Base
+    from app.main import app
+
+    Base.metadata.create_all(bind=engine)
+    try:
+        with TestClient(app) as client:
+            ids = [
+                task["id"]
+                for start in range(0, args.tasks, 1000)
+                for task in client.post(
+                    "/api/v1/tasks/bulk",
+                    json=[
+                        {"title": f"Task {i}", "description": f"Task {i} description"}
+                        for i in range(start, min(start + 1000, args.tasks))
+                    ],
+                ).json()
+            ]
+
+            updates = [
+                {"title": "Renamed"},
+                {"status": "в работе"},
+                {"description": "Changed", "status": "завершено"},
+            ]
+            latencies = []
+            for i in range(args.requests):
+                task_id = random.choice(ids)
+                started = time.perf_counter()
+                response = client.put(f"/api/v1/tasks/{task_id}", json=updates[i % len(updates)])
+                latencies.append((time.perf_counter() - started) * 1000)
+                assert response.status_code == 200, response.text
+    finally:
+        engine.dispose()
+        Path(DB_NAME).unlink(missing_ok=True)
+
+    print(f"PUT /api/v1/tasks/{{task_id}}: {args.requests} requests over {args.tasks} tasks")
+    print(f"  mean {statistics.mean(latencies):.3f} ms")
+    print(f"  p50  {percentile(latencies, 0.50):.3f} ms")
+    print(f"  p95  {percentile(latencies, 0.95):.3f} ms")
+    print(f"  p99  {percentile(latencies, 0.99):.3f} ms")
+    print(f"  {len(latencies) / (sum(latencies) / 1000):.0f} requests/s")
+
+
+if __name__ == "__main__":
+    main()
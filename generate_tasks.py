@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""Synthetic task data generator for Task Manager.
+
+Bulk-loads realistic tasks straight into the SQLite database, bypassing
+the API, so large tables for reproducing performance problems take
+minutes to build:
+
+    python generate_tasks.py --rows 10000000 --db task_manager.db \\
+        --statuses created=50,in_progress=30,completed=20 --days 730 --language mixed
+
+While loading, the triggers and list indexes are dropped and the
+connection trades durability for speed (no journal, no fsync). Afterwards
+the indexes are rebuilt, along with the data the triggers maintain: the
+per-status counters, the daily rollups and the full-text index. Time in
+status is not generated.
+"""
+
+import argparse
+import os
+import random
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from uuid import UUID
+
+BATCH_SIZE = 100_000
+
+# Distinct titles and descriptions generated up front per language; rows
+# pick from these pools instead of assembling text word by word.
+TEXT_POOL_SIZE = 20_000
+
+# Connection settings for the load only; WAL is restored at the end
+LOAD_PRAGMAS = {
+    "journal_mode": "OFF",
+    "synchronous": "OFF",
+    "locking_mode": "EXCLUSIVE",
+    "temp_store": "MEMORY",
+    "cache_size": "-524288",
+}
+
+WORDS = {
+    "ru": [
+        "подготовить", "отчет", "проверить", "исправить", "ошибку", "в", "модуле", "оплаты",
+        "обновить", "документацию", "встреча", "с", "командой", "по", "релизу", "настроить",
+        "сервер", "мониторинг", "база", "данных", "миграция", "клиент", "запрос", "тесты",
+        "интерфейс", "квартальный", "план", "задачи", "согласовать", "бюджет", "дизайн",
+        "страницы", "аналитика", "продаж", "резервное", "копирование", "уведомления", "поиск",
+    ],
+    "en": [
+        "prepare", "report", "review", "fix", "bug", "in", "payment", "module", "update",
+        "documentation", "meeting", "with", "team", "about", "release", "configure", "server",
+        "monitoring", "database", "migration", "customer", "request", "tests", "interface",
+        "quarterly", "plan", "tasks", "approve", "budget", "design", "page", "analytics",
+        "sales", "backup", "notifications", "search", "deploy", "refactor", "the", "for",
+    ],
+}
+
+STATUS_ALIASES = {
+    "created": "CREATED",
+    "создано": "CREATED",
+    "in_progress": "IN_PROGRESS",
+    "в работе": "IN_PROGRESS",
+    "completed": "COMPLETED",
+    "завершено": "COMPLETED",
+}
+
+TITLE_MAX_LENGTH = 200
+DESCRIPTION_MAX_LENGTH = 1000
+
+
+def parse_statuses(text):
+    """Parse "created=50,in_progress=30,completed=20" into status name weights."""
+    weights = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        status = STATUS_ALIASES.get(name.strip().lower())
+        if status is None:
+            raise argparse.ArgumentTypeError(f"unknown status: {name.strip()}")
+        weights[status] = float(weight)
+    return weights
+
+
+def parse_range(text):
+    """Parse "3-8" (or "5") into a (min, max) pair."""
+    low, _, high = text.partition("-")
+    low, high = int(low), int(high or low)
+    if low < 1 or high < low:
+        raise argparse.ArgumentTypeError(f"invalid range: {text}")
+    return low, high
+
+
+def timestamp(value):
+    """Format a datetime the way SQLAlchemy stores it in SQLite."""
+    return value.isoformat(sep=" ", timespec="microseconds")
+
+
+class TaskGenerator:
+    """Produce tasks table rows with the configured distributions."""
+
+    def __init__(self, args, now):
+        self.random = random.Random(args.seed)
+        self.statuses = list(args.statuses)
+        self.status_weights = list(args.statuses.values())
+        languages = ["ru", "en"] if args.language == "mixed" else [args.language]
+        self.titles = [
+            self.text(WORDS[language], args.title_words, TITLE_MAX_LENGTH)
+            for language in languages
+            for _ in range(TEXT_POOL_SIZE // len(languages))
+        ]
+        self.descriptions = [
+            self.text(WORDS[language], args.description_words, DESCRIPTION_MAX_LENGTH)
+            for language in languages
+            for _ in range(TEXT_POOL_SIZE // len(languages))
+        ]
+        self.now = now
+        self.spread = args.days * 86400
+
+    def text(self, vocabulary, words, max_length):
+        text = " ".join(self.random.choices(vocabulary, k=self.random.randint(*words)))
+        return text[:max_length].capitalize()
+
+    def rows(self, count):
+        """Yield (id, title, description, status, created_at, updated_at, status_changed_at)."""
+        statuses = self.random.choices(self.statuses, weights=self.status_weights, k=count)
+        for status in statuses:
+            age = self.random.random() * self.spread
+            created_at = self.now - timedelta(seconds=age)
+            updated_at = created_at
+            if status != "CREATED":
+                # Moved on within a week of creation, never in the future
+                updated_at = created_at + timedelta(seconds=self.random.random() * min(age, 7 * 86400))
+            yield (
+                str(UUID(int=self.random.getrandbits(128), version=4)),
+                self.random.choice(self.titles),
+                self.random.choice(self.descriptions),
+                status,
+                timestamp(created_at),
+                timestamp(updated_at),
+                timestamp(updated_at),
+            )
+
+
+def create_schema(path):
+    """Create the tables, indexes and triggers if the database lacks them."""
+    from sqlalchemy import create_engine
+
+    from app.database.models import Base
+
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        Base.metadata.create_all(bind=engine)
+    finally:
+        engine.dispose()
+
+
+def derived_ddl():
+    """The trigger statements of the models, with their seeding statements."""
+    from app.database.models import TASK_COUNTER_DDL, TASK_ROLLUP_DDL, TASK_SEARCH_DDL
+
+    return TASK_COUNTER_DDL + TASK_SEARCH_DDL + TASK_ROLLUP_DDL
+
+
+def list_indexes():
+    """CREATE INDEX statements for the indexes of the tasks table."""
+    from sqlalchemy.dialects import sqlite
+    from sqlalchemy.schema import CreateIndex
+
+    from app.database.models import TaskModel
+
+    return {
+        index.name: str(CreateIndex(index, if_not_exists=True).compile(dialect=sqlite.dialect()))
+        for index in TaskModel.__table__.indexes
+    }
+
+
+def load(args):
+    """Bulk-insert the generated rows and rebuild what depends on them."""
+    create_schema(args.db)
+    ddl = derived_ddl()
+    indexes = list_indexes()
+    triggers = [
+        match.group(1)
+        for statement in ddl
+        for match in [re.search(r"CREATE TRIGGER IF NOT EXISTS (\w+)", statement)]
+        if match
+    ]
+
+    connection = sqlite3.connect(args.db, isolation_level=None)
+    try:
+        for name, value in LOAD_PRAGMAS.items():
+            connection.execute(f"PRAGMA {name} = {value}")
+        for name in triggers:
+            connection.execute(f"DROP TRIGGER IF EXISTS {name}")
+        for name in indexes:
+            connection.execute(f"DROP INDEX IF EXISTS {name}")
+        if args.replace:
+            connection.execute("DELETE FROM tasks")
+            connection.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('delete-all')")
+            connection.execute("DELETE FROM task_status_durations")
+
+        generator = TaskGenerator(args, datetime.utcnow())
+        started = time.perf_counter()
+        for offset in range(0, args.rows, BATCH_SIZE):
+            count = min(BATCH_SIZE, args.rows - offset)
+            connection.execute("BEGIN")
+            connection.executemany(
+                "INSERT INTO tasks (id, title, description, status, created_at, updated_at,"
+                " status_changed_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                generator.rows(count),
+            )
+            connection.execute("COMMIT")
+            done = offset + count
+            elapsed = time.perf_counter() - started
+            print(f"\r📦 {done:,}/{args.rows:,} tasks, {done / elapsed:,.0f} rows/s", end="", flush=True)
+        print()
+
+        step = time.perf_counter()
+        for statement in indexes.values():
+            connection.execute(statement)
+        print(f"🗂️ Indexes rebuilt in {time.perf_counter() - step:.1f} s")
+
+        # Emptied counters and rollups are refilled by the seeding statements
+        # that follow the triggers; the full-text index rebuilds itself when
+        # its row count no longer matches.
+        step = time.perf_counter()
+        connection.execute("BEGIN")
+        connection.execute("DELETE FROM task_counters")
+        connection.execute("DELETE FROM task_daily_stats")
+        for statement in ddl:
+            connection.execute(statement)
+        connection.execute("COMMIT")
+        print(f"🔁 Triggers, counters, rollups and search index rebuilt in {time.perf_counter() - step:.1f} s")
+
+        connection.execute("ANALYZE")
+        connection.execute("PRAGMA locking_mode = NORMAL")
+        connection.execute("PRAGMA journal_mode = WAL")
+    finally:
+        connection.close()
+    return time.perf_counter() - started
+
+
+def main():
+    """Parse arguments and generate the tasks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="number of tasks to generate")
+    parser.add_argument(
+        "--db", default=os.getenv("DB_NAME", "task_manager.db"), help="SQLite database file"
+    )
+    parser.add_argument(
+        "--statuses",
+        type=parse_statuses,
+        default=parse_statuses("created=50,in_progress=30,completed=20"),
+        help="status weights, e.g. created=50,in_progress=30,completed=20",
+    )
+    parser.add_argument("--days", type=float, default=365, help="spread created_at over this many past days")
+    parser.add_argument("--language", choices=["ru", "en", "mixed"], default="mixed", help="text language")
+    parser.add_argument("--title-words", type=parse_range, default=(2, 8), help="words per title, e.g. 2-8")
+    parser.add_argument(
+        "--description-words", type=parse_range, default=(5, 40), help="words per description, e.g. 5-40"
+    )
+    parser.add_argument("--replace", action="store_true", help="delete existing tasks first")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for reproducible data")
+    args = parser.parse_args()
+
+    if args.rows < 1:
+        parser.error("--rows must be positive")
+
+    print(f"🚀 Generating {args.rows:,} tasks into {args.db}")
+    try:
+        elapsed = load(args)
+    except sqlite3.Error as e:
+        print(f"\n❌ Failed: {e}")
+        sys.exit(1)
+    print(f"✅ Done in {elapsed:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,8 +7,11 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
+from app.database.backends import task_storage
 from app.database.connection import get_db
+from app.database.memory_storage import InMemoryTaskStorage
 from app.database.models import Base
+from app.database.version import tasks_version
 from app.models.task import Task, TaskStatus
 
 
@@ -42,8 +45,12 @@ def client():
         # Delete all tasks
         db.query(Base.metadata.tables['tasks']).delete()
         db.commit()
+        # Written behind the storage layer: invalidate cached list pages
+        tasks_version.bump()
     finally:
         db.close()
+    if isinstance(task_storage, InMemoryTaskStorage):
+        task_storage.clear()
     
     # Clear overrides
     app.dependency_overrides.clear()
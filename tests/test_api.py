@@ -1,10 +1,32 @@
 """API endpoint tests."""
 
+import csv
+import io
+import json
+
 import pytest
 from fastapi import status
-from uuid import uuid4
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from uuid import UUID, uuid4
 
+from app.api.dependencies import (
+    get_async_task_reader,
+    get_async_task_service,
+    get_sync_task_reader,
+    get_sync_task_service,
+    get_task_reader,
+    get_task_service,
+)
+from app.database.connection import get_db, get_read_db
+from app.database.models import Base
+from app.main import app
+from app.database.storage import TaskStorage
+from app.database.write_batcher import BatchingTaskStorage, WriteBatcher, write_batcher
 from app.models.task import TaskStatus
+from app.schemas.task_schemas import TaskListResponse, TaskResponse
+from app.services.task_service import AsyncTaskService
 
 
 class TestTaskAPI:
@@ -61,6 +83,38 @@ class TestTaskAPI:
         response = client.post("/api/v1/tasks/", json=task_data)
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
+    def test_create_tasks_bulk(self, client):
+        """Test creating several tasks in one request."""
+        tasks_data = [
+            {"title": "Task 1", "description": "First task", "status": "создано"},
+            {"title": "Task 2", "description": "Second task", "status": "в работе"},
+            {"title": "Task 3", "description": "Third task"},
+        ]
+        
+        response = client.post("/api/v1/tasks/bulk", json=tasks_data)
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()
+        assert [task["title"] for task in data] == ["Task 1", "Task 2", "Task 3"]
+        assert data[2]["status"] == "создано"
+        for task in data:
+            get_response = client.get(f"/api/v1/tasks/{task['id']}")
+            assert get_response.status_code == status.HTTP_200_OK
+            assert get_response.json() == task
+
+    def test_create_tasks_bulk_invalid_item(self, client):
+        """Test that one invalid item rejects the whole batch."""
+        total_before = client.get("/api/v1/tasks/").json()["total"]
+        tasks_data = [
+            {"title": "Task 1", "description": "First task"},
+            {"title": "", "description": "Invalid task"},
+        ]
+        
+        response = client.post("/api/v1/tasks/bulk", json=tasks_data)
+        
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert client.get("/api/v1/tasks/").json()["total"] == total_before
+
     def test_get_task_success(self, client):
         """Test successful task retrieval."""
         # First create a task
@@ -164,6 +218,55 @@ class TestTaskAPI:
         # Check that we have at least 15 tasks total
         assert data["total"] >= 15
 
+    def test_get_tasks_with_cursor_pagination(self, client):
+        """Test walking the task list with cursors."""
+        for i in range(7):
+            task_data = {
+                "title": f"Task {i+1}",
+                "description": f"Task {i+1} description",
+                "status": "в работе"
+            }
+            response = client.post("/api/v1/tasks/", json=task_data)
+            assert response.status_code == status.HTTP_201_CREATED
+        
+        response = client.get("/api/v1/tasks/?status=в работе&limit=100")
+        expected_ids = [task["id"] for task in response.json()["tasks"]]
+        
+        # Walk the same list three tasks at a time
+        seen_ids = []
+        response = client.get("/api/v1/tasks/?status=в работе&limit=3")
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            data = response.json()
+            seen_ids.extend(task["id"] for task in data["tasks"])
+            if data["next_cursor"] is None:
+                break
+            response = client.get(
+                "/api/v1/tasks/",
+                params={"status": "в работе", "limit": 3, "cursor": data["next_cursor"]}
+            )
+        
+        assert seen_ids == expected_ids
+        assert len(seen_ids) >= 7
+
+    def test_get_tasks_with_invalid_cursor(self, client):
+        """Test getting tasks with a malformed cursor."""
+        response = client.get("/api/v1/tasks/?cursor=not-a-cursor")
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_get_tasks_without_total(self, client):
+        """Test getting tasks without computing the total."""
+        task_data = {"title": "Task 1", "description": "First task", "status": "создано"}
+        client.post("/api/v1/tasks/", json=task_data)
+        
+        response = client.get("/api/v1/tasks/?include_total=false")
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] is None
+        assert len(data["tasks"]) >= 1
+
     def test_update_task_success(self, client):
         """Test successful task update."""
         # First create a task
@@ -223,6 +326,58 @@ class TestTaskAPI:
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+    def test_update_tasks_status_by_ids(self, client):
+        """Test moving selected tasks to a new status."""
+        tasks_data = [
+            {"title": f"Task {i+1}", "description": f"Task {i+1} description", "status": "в работе"}
+            for i in range(3)
+        ]
+        tasks = client.post("/api/v1/tasks/bulk", json=tasks_data).json()
+        ids = [task["id"] for task in tasks[:2]]
+        
+        response = client.patch(
+            "/api/v1/tasks/status",
+            json={"status": "завершено", "ids": ids}
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"updated": 2}
+        for task in tasks:
+            data = client.get(f"/api/v1/tasks/{task['id']}").json()
+            if task["id"] in ids:
+                assert data["status"] == "завершено"
+                assert data["updated_at"] > task["updated_at"]
+            else:
+                assert data["status"] == "в работе"
+                assert data["updated_at"] == task["updated_at"]
+
+    def test_update_tasks_status_by_filter(self, client):
+        """Test moving tasks selected by current status and creation date."""
+        client.post(
+            "/api/v1/tasks/bulk",
+            json=[{"title": "Task", "description": "Task description", "status": "в работе"}]
+        )
+        
+        response = client.patch(
+            "/api/v1/tasks/status",
+            json={
+                "status": "завершено",
+                "current_status": "в работе",
+                "created_before": "2999-01-01T00:00:00+00:00"
+            }
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["updated"] >= 1
+        remaining = client.get("/api/v1/tasks/?status=в работе").json()
+        assert remaining["total"] == 0
+
+    def test_update_tasks_status_without_selection(self, client):
+        """Test that a bulk status update requires a selection."""
+        response = client.patch("/api/v1/tasks/status", json={"status": "завершено"})
+        
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
     def test_delete_task_success(self, client):
         """Test successful task deletion."""
         # First create a task
@@ -251,6 +406,321 @@ class TestTaskAPI:
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+    @pytest.mark.skipif(
+        write_batcher is not None,
+        reason="group-committed writes use the batcher's own sessions"
+    )
+    def test_requests_use_injected_session(self, client):
+        """Test that the get_db dependency reaches the storage layer."""
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(bind=engine)
+        TestingSessionLocal = sessionmaker(bind=engine)
+        
+        def override_get_db():
+            db = TestingSessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+        
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_read_db] = override_get_db
+        app.dependency_overrides[get_task_service] = get_sync_task_service
+        app.dependency_overrides[get_task_reader] = get_sync_task_reader
+        
+        task_data = {"title": "Test Task", "description": "This is a test task"}
+        task_id = client.post("/api/v1/tasks/", json=task_data).json()["id"]
+        
+        # The task only exists in the overriding database
+        assert client.get(f"/api/v1/tasks/{task_id}").status_code == status.HTTP_200_OK
+        assert TaskStorage().get_task(UUID(task_id)) is None
+
+    def test_get_task_not_modified(self, client):
+        """Test that a matching If-None-Match gets an empty 304."""
+        task_data = {"title": "Test Task", "description": "This is a test task"}
+        task_id = client.post("/api/v1/tasks/", json=task_data).json()["id"]
+        etag = client.get(f"/api/v1/tasks/{task_id}").headers["ETag"]
+        
+        response = client.get(f"/api/v1/tasks/{task_id}", headers={"If-None-Match": etag})
+        
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+
+    def test_get_task_etag_changes_on_update(self, client):
+        """Test that updating a task invalidates its ETag."""
+        task_data = {"title": "Test Task", "description": "This is a test task"}
+        task_id = client.post("/api/v1/tasks/", json=task_data).json()["id"]
+        etag = client.get(f"/api/v1/tasks/{task_id}").headers["ETag"]
+        client.put(f"/api/v1/tasks/{task_id}", json={"title": "Updated Task"})
+        
+        response = client.get(f"/api/v1/tasks/{task_id}", headers={"If-None-Match": etag})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+        assert response.json()["title"] == "Updated Task"
+
+    def test_get_tasks_not_modified_until_write(self, client):
+        """Test that a list ETag holds until the page changes."""
+        task_data = {"title": "Test Task", "description": "This is a test task"}
+        client.post("/api/v1/tasks/", json=task_data)
+        etag = client.get("/api/v1/tasks/").headers["ETag"]
+        
+        response = client.get("/api/v1/tasks/", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        
+        client.post("/api/v1/tasks/", json=task_data)
+        response = client.get("/api/v1/tasks/", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["total"] == 2
+
+    def test_search_tasks(self, client):
+        """Test ranked, case-insensitive prefix search in Cyrillic text."""
+        client.post("/api/v1/tasks/bulk", json=[
+            {"title": "Проверить отчет", "description": "Квартальный отчет"},
+            {"title": "Позвонить клиенту", "description": "Обсудить отчеты за год"},
+            {"title": "Купить молоко", "description": "В магазине"},
+        ])
+        
+        response = client.get("/api/v1/tasks/search", params={"q": "ОТЧЕТ"})
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] == 2
+        assert [task["title"] for task in data["tasks"]] == ["Проверить отчет", "Позвонить клиенту"]
+
+    def test_search_tasks_with_filter_and_pagination(self, client):
+        """Test search combined with a status filter and a page size."""
+        client.post("/api/v1/tasks/bulk", json=[
+            {"title": f"Отчет {i}", "description": "Отчет", "status": "завершено"}
+            for i in range(3)
+        ] + [{"title": "Отчет в работе", "description": "Отчет", "status": "в работе"}])
+        
+        response = client.get(
+            "/api/v1/tasks/search",
+            params={"q": "отчет", "status": "завершено", "limit": 2}
+        )
+        
+        data = response.json()
+        assert data["total"] == 3
+        assert len(data["tasks"]) == 2
+        assert all(task["status"] == "завершено" for task in data["tasks"])
+
+    def test_search_tasks_ignores_query_syntax(self, client):
+        """Test that FTS5 operators in the query are searched as plain text."""
+        response = client.get("/api/v1/tasks/search", params={"q": 'title: "NOT OR*'})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["total"] == 0
+
+    def test_export_tasks_ndjson(self, client):
+        """Test streaming every task as one JSON object per line."""
+        client.post("/api/v1/tasks/bulk", json=[
+            {"title": f"Task {i}", "description": "Exported task"} for i in range(3)
+        ])
+        
+        response = client.get("/api/v1/tasks/export")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["title"] for row in rows] == ["Task 0", "Task 1", "Task 2"]
+        assert rows[0]["status"] == "создано"
+
+    def test_export_tasks_csv_with_filters(self, client):
+        """Test CSV export filtered by status and creation date."""
+        client.post("/api/v1/tasks/bulk", json=[
+            {"title": "Done, \"quoted\"", "description": "Line\nbreak", "status": "завершено"},
+            {"title": "Open", "description": "Not exported"},
+        ])
+        
+        response = client.get(
+            "/api/v1/tasks/export",
+            params={"format": "csv", "status": "завершено", "created_after": "2000-01-01T00:00:00Z"}
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 1
+        assert rows[0]["title"] == 'Done, "quoted"'
+        assert rows[0]["description"] == "Line\nbreak"
+        
+        response = client.get(
+            "/api/v1/tasks/export",
+            params={"format": "csv", "created_before": "2000-01-01T00:00:00Z"}
+        )
+        assert response.text.splitlines() == [
+            "id,title,description,status,created_at,updated_at"
+        ]
+
+    def test_import_tasks(self, client):
+        """Test importing NDJSON lines and reporting the invalid ones."""
+        body = "\n".join([
+            json.dumps({"title": "Импорт 1", "description": "Первая"}, ensure_ascii=False),
+            "",
+            json.dumps({"title": "", "description": "Пустое название"}, ensure_ascii=False),
+            "{not json",
+            json.dumps({"title": "Импорт 2", "description": "Вторая", "status": "завершено"},
+                       ensure_ascii=False),
+        ])
+        
+        response = client.post(
+            "/api/v1/tasks/import",
+            params={"chunk_size": 1},
+            content=body.encode(),
+            headers={"Content-Type": "application/x-ndjson"}
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["imported"] == 2
+        assert data["failed"] == 2
+        assert [error["line"] for error in data["errors"]] == [3, 4]
+        assert "title" in data["errors"][0]["error"]
+        
+        tasks = client.get("/api/v1/tasks/").json()
+        assert tasks["total"] == 2
+        assert {task["title"] for task in tasks["tasks"]} == {"Импорт 1", "Импорт 2"}
+
+    def test_import_tasks_streamed_body(self, client):
+        """Test that lines split across body chunks are reassembled."""
+        lines = [
+            json.dumps({"title": f"Task {i}", "description": "Streamed"}).encode() + b"\n"
+            for i in range(10)
+        ]
+        body = b"".join(lines)
+        
+        def chunks():
+            for start in range(0, len(body), 7):
+                yield body[start:start + 7]
+        
+        response = client.post("/api/v1/tasks/import", content=chunks())
+        
+        assert response.json() == {"imported": 10, "failed": 0, "errors": []}
+
+    def test_get_stats(self, client):
+        """Test that stats follow creates and status changes."""
+        before = client.get("/api/v1/tasks/stats").json()
+        task_data = {"title": "Test Task", "description": "This is a test task"}
+        ids = [client.post("/api/v1/tasks/", json=task_data).json()["id"] for _ in range(3)]
+        client.put(f"/api/v1/tasks/{ids[0]}", json={"status": "завершено"})
+        
+        response = client.get("/api/v1/tasks/stats", params={"days": 1})
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] == 3
+        assert data["by_status"] == {"создано": 2, "в работе": 0, "завершено": 1}
+        assert len(data["daily"]) == 1
+        today_before = next(
+            (day for day in before["daily"] if day["day"] == data["daily"][0]["day"]),
+            {"created": 0, "completed": 0}
+        )
+        assert data["daily"][0]["created"] - today_before["created"] == 3
+        assert data["daily"][0]["completed"] - today_before["completed"] == 1
+        transitions_before = before["time_in_status"].get("создано", {}).get("transitions", 0)
+        assert data["time_in_status"]["создано"]["transitions"] == transitions_before + 1
+
+    def test_read_endpoints_match_response_schemas(self, client):
+        """Test that the orjson read path renders exactly the response schemas."""
+        task_data = {"title": "Test Task", "description": "This is a test task"}
+        created = client.post("/api/v1/tasks/", json=task_data).json()
+        
+        task = client.get(f"/api/v1/tasks/{created['id']}").json()
+        page = client.get("/api/v1/tasks/").json()
+        
+        assert task == created
+        assert TaskResponse.model_validate(task).model_dump(mode="json") == task
+        assert TaskListResponse.model_validate(page).model_dump(mode="json") == page
+        assert page["tasks"] == [created]
+
+    def test_get_tasks_with_fields(self, client):
+        """Test projecting list pages to some fields, across cursor pages."""
+        client.post("/api/v1/tasks/bulk", json=[
+            {"title": f"Task {i}", "description": "Long description " * 50} for i in range(3)
+        ])
+        
+        response = client.get("/api/v1/tasks/", params={"fields": "title,status", "limit": 2})
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["tasks"] == [
+            {"title": "Task 2", "status": "создано"},
+            {"title": "Task 1", "status": "создано"},
+        ]
+        assert data["total"] == 3
+        
+        response = client.get(
+            "/api/v1/tasks/",
+            params={"fields": "title,status", "limit": 2, "cursor": data["next_cursor"]}
+        )
+        assert response.json()["tasks"] == [{"title": "Task 0", "status": "создано"}]
+
+    def test_get_task_with_fields(self, client):
+        """Test projecting a single task, from the database and from the cache."""
+        task_data = {"title": "Test Task", "description": "This is a test task"}
+        task_id = client.post("/api/v1/tasks/", json=task_data).json()["id"]
+        
+        uncached = client.get(f"/api/v1/tasks/{task_id}", params={"fields": "title,id"})
+        client.get(f"/api/v1/tasks/{task_id}")
+        cached = client.get(f"/api/v1/tasks/{task_id}", params={"fields": "title,id"})
+        
+        assert uncached.json() == {"id": task_id, "title": "Test Task"}
+        assert cached.json() == uncached.json()
+        assert cached.headers["ETag"] == uncached.headers["ETag"]
+
+    def test_get_tasks_with_unknown_field(self, client):
+        """Test that projecting an unknown field is rejected."""
+        response = client.get("/api/v1/tasks/", params={"fields": "title,secret"})
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_cache_stats(self, client):
+        """Test that repeated reads of a task show up as cache hits."""
+        task_data = {"title": "Test Task", "description": "This is a test task"}
+        task_id = client.post("/api/v1/tasks/", json=task_data).json()["id"]
+        client.get(f"/api/v1/tasks/{task_id}")
+        hits = client.get("/cache/stats").json()["tasks"]["hits"]
+        
+        client.get(f"/api/v1/tasks/{task_id}")
+        stats = client.get("/cache/stats").json()["tasks"]
+        
+        assert stats["hits"] == hits + 1
+        assert {"size", "max_size", "misses", "evictions", "hit_rate"} <= set(stats)
+
+    def test_metrics(self, client):
+        """Test request, threadpool and statement metrics in the Prometheus format."""
+        task_data = {"title": "Test Task", "description": "This is a test task"}
+        task_id = client.post("/api/v1/tasks/", json=task_data).json()["id"]
+        client.get(f"/api/v1/tasks/{task_id}")
+        client.get(f"/api/v1/tasks/{uuid4()}")
+        TaskStorage().count()
+        
+        response = client.get("/metrics")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        lines = response.text.splitlines()
+        assert any(
+            line.startswith('http_requests_total{method="GET",route="/api/v1/tasks/{task_id}",status="404"} ')
+            for line in lines
+        )
+        assert any(
+            line.startswith('http_request_duration_seconds_bucket{method="POST",route="/api/v1/tasks/",'
+                            'status="201",le="+Inf"}')
+            for line in lines
+        )
+        assert any(line.startswith("threadpool_threads_max ") for line in lines)
+        assert any(
+            line.startswith('db_statement_duration_seconds_count{engine="write",statement="SELECT",')
+            for line in lines
+        )
+
     def test_root_endpoint(self, client):
         """Test root endpoint."""
         response = client.get("/")
@@ -268,3 +738,65 @@ class TestTaskAPI:
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert data["status"] == "healthy"
+
+
+class TestAsyncBackendAPI:
+    """Test cases for the API running on the aiosqlite storage backend."""
+
+    @pytest.fixture
+    def async_client(self, client):
+        """Create a test client whose routes use the async storage."""
+        app.dependency_overrides[get_task_service] = get_async_task_service
+        app.dependency_overrides[get_task_reader] = get_async_task_reader
+        return client
+
+    def test_task_lifecycle(self, async_client):
+        """Test creating, listing, updating and deleting a task."""
+        task_data = {"title": "Test Task", "description": "This is a test task"}
+        
+        create_response = async_client.post("/api/v1/tasks/", json=task_data)
+        assert create_response.status_code == status.HTTP_201_CREATED
+        task_id = create_response.json()["id"]
+        
+        list_response = async_client.get("/api/v1/tasks/?limit=100")
+        assert task_id in [task["id"] for task in list_response.json()["tasks"]]
+        
+        update_response = async_client.put(
+            f"/api/v1/tasks/{task_id}", json={"status": "в работе"}
+        )
+        assert update_response.json()["status"] == "в работе"
+        
+        assert async_client.delete(f"/api/v1/tasks/{task_id}").status_code == status.HTTP_204_NO_CONTENT
+        assert async_client.get(f"/api/v1/tasks/{task_id}").status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestWriteBatchingAPI:
+    """Test cases for the API with group-committed writes."""
+
+    @pytest.fixture
+    def batching_client(self, client):
+        """Create a test client whose single-task writes go through a batcher."""
+        batcher = WriteBatcher(max_wait_ms=1)
+        
+        def override_get_task_service():
+            return AsyncTaskService(BatchingTaskStorage(TaskStorage(), batcher))
+        
+        app.dependency_overrides[get_task_service] = override_get_task_service
+        app.dependency_overrides[get_task_reader] = get_sync_task_reader
+        yield client
+        batcher.close()
+
+    def test_task_lifecycle(self, batching_client):
+        """Test creating, updating and deleting a task through the batcher."""
+        task_data = {"title": "Test Task", "description": "This is a test task"}
+        
+        task_id = batching_client.post("/api/v1/tasks/", json=task_data).json()["id"]
+        
+        update_response = batching_client.put(
+            f"/api/v1/tasks/{task_id}", json={"title": "Updated Task"}
+        )
+        assert update_response.json()["title"] == "Updated Task"
+        assert batching_client.get(f"/api/v1/tasks/{task_id}").json()["title"] == "Updated Task"
+        
+        assert batching_client.delete(f"/api/v1/tasks/{task_id}").status_code == status.HTTP_204_NO_CONTENT
+        assert batching_client.delete(f"/api/v1/tasks/{task_id}").status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,391 @@
+"""Database schema and query plan tests."""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from uuid import uuid4
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, select, update
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.database import queries
+from app.database.connection import engine, read_engine
+from app.database.memory_storage import InMemoryTaskStorage
+from app.database.models import Base, TaskModel, TaskStatusEnum
+from app.database.slow_queries import log_slow_queries
+from app.database.storage import TaskStorage
+from app.database.write_batcher import WriteBatcher
+from app.models.task import Task, TaskStatus
+
+
+@pytest.fixture
+def migrated_engine():
+    """Create an in-memory database migrated with Alembic to head."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    config = Config("alembic.ini")
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+    yield engine
+    engine.dispose()
+
+
+def explain(session: Session, stmt) -> str:
+    """Return the SQLite query plan for a statement as a single string."""
+    sql = str(
+        stmt.compile(
+            dialect=session.bind.dialect,
+            compile_kwargs={"literal_binds": True},
+        )
+    )
+    rows = session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").all()
+    return "\n".join(row[-1] for row in rows)
+
+
+class TestMigrations:
+    """Test cases for the Alembic migration chain."""
+
+    def test_upgrade_creates_tasks_table(self, migrated_engine):
+        """Test that migrating to head creates the tasks table."""
+        columns = {c["name"] for c in inspect(migrated_engine).get_columns("tasks")}
+
+        assert {"id", "title", "description", "status", "created_at", "updated_at"} <= columns
+
+    def test_upgrade_creates_list_indexes(self, migrated_engine):
+        """Test that migrating to head creates the list indexes."""
+        indexes = {
+            index["name"]: index["column_names"]
+            for index in inspect(migrated_engine).get_indexes("tasks")
+        }
+
+        assert indexes["ix_tasks_status_created_at_id"] == ["status", "created_at", "id"]
+        assert indexes["ix_tasks_created_at_id"] == ["created_at", "id"]
+
+    def test_upgrade_adopts_create_all_schema(self):
+        """Test that every migration runs on a database built by create_all()."""
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        with Session(engine) as session:
+            TaskStorage(session).create_task(Task(title="Existing", description="Before upgrade"))
+        
+        config = Config("alembic.ini")
+        with engine.begin() as connection:
+            config.attributes["connection"] = connection
+            command.upgrade(config, "head")
+        
+        with Session(engine) as session:
+            storage = TaskStorage(session)
+            assert storage.count() == 1
+            assert storage.search_tasks("Existing")[1] == 1
+        engine.dispose()
+
+
+class TestTaskSearch:
+    """Test cases for the FTS5 task search index."""
+
+    def test_search_follows_writes(self, migrated_engine):
+        """Test that the index tracks inserts, title updates and deletes."""
+        with Session(migrated_engine) as session:
+            storage = TaskStorage(session)
+            task = storage.create_task(Task(title="Купить молоко", description="В магазине"))
+            
+            assert storage.search_tasks("молоко")[1] == 1
+            
+            storage.update_task(task.id, {"title": "Купить хлеб"})
+            assert storage.search_tasks("молоко")[1] == 0
+            assert storage.search_tasks("хлеб")[1] == 1
+            
+            storage.delete_task(task.id)
+            assert storage.search_tasks("хлеб")[1] == 0
+
+    def test_search_uses_fts_index(self, migrated_engine):
+        """Test that a search is an FTS5 index lookup joined by rowid."""
+        with Session(migrated_engine) as session:
+            match = queries.match_query("молоко")
+            plan = explain(session, queries.search_tasks(match).limit(10))
+
+        assert "tasks_fts VIRTUAL TABLE INDEX" in plan
+        assert "SEARCH tasks USING INTEGER PRIMARY KEY (rowid=?)" in plan
+
+
+class TestListQueryPlan:
+    """Test cases for the task list query plan."""
+
+    def test_filtered_list_uses_status_index(self, migrated_engine):
+        """Test that filtering by status seeks the composite index without sorting."""
+        with Session(migrated_engine) as session:
+            stmt = queries.order_tasks(queries.select_tasks(TaskStatus.IN_PROGRESS)).limit(10)
+            plan = explain(session, stmt)
+
+        assert "ix_tasks_status_created_at_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_unfiltered_list_uses_created_at_index(self, migrated_engine):
+        """Test that the unfiltered list walks the created_at index without sorting."""
+        with Session(migrated_engine) as session:
+            stmt = queries.order_tasks(queries.select_tasks()).limit(10)
+            plan = explain(session, stmt)
+
+        assert "ix_tasks_created_at_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_projected_list_reads_only_requested_columns(self):
+        """Test that a ?fields= page selects just those columns."""
+        stmt = queries.select_page(fields=("id", "title", "created_at"))
+        
+        assert [column.name for column in stmt.selected_columns] == ["id", "title", "created_at"]
+
+
+class TestTaskCounters:
+    """Test cases for the trigger-maintained task counters."""
+
+    def test_counters_follow_inserts_updates_and_deletes(self, migrated_engine):
+        """Test that counters track every write to the tasks table."""
+        with Session(migrated_engine) as session:
+            storage = TaskStorage(session)
+            tasks = [
+                TaskModel(
+                    id=str(uuid4()),
+                    title=f"Task {i}",
+                    description="",
+                    status=TaskStatusEnum.CREATED
+                )
+                for i in range(3)
+            ]
+            session.add_all(tasks)
+            session.commit()
+
+            tasks[0].status = TaskStatusEnum.COMPLETED
+            session.delete(tasks[1])
+            session.commit()
+
+            assert storage.count() == 2
+            assert storage.get_tasks(TaskStatus.CREATED)[1] == 1
+            assert storage.get_tasks(TaskStatus.COMPLETED)[1] == 1
+            assert storage.get_tasks(TaskStatus.IN_PROGRESS)[1] == 0
+
+    def test_total_does_not_scan_tasks(self, migrated_engine):
+        """Test that reading a filtered total is a counters primary key lookup."""
+        with Session(migrated_engine) as session:
+            plan = explain(session, queries.count_tasks(TaskStatus.CREATED))
+
+        assert "task_counters" in plan
+        assert "SCAN tasks" not in plan
+
+
+class TestTaskRollups:
+    """Test cases for the trigger-maintained statistics rollups."""
+
+    def test_rollups_follow_status_changes(self, migrated_engine):
+        """Test daily counts and time in status after creating and completing tasks."""
+        with Session(migrated_engine) as session:
+            storage = TaskStorage(session)
+            created_at = datetime(2026, 1, 1, 12, 0, 0)
+            tasks = storage.create_tasks([
+                Task(title=f"Task {i}", description="", created_at=created_at, updated_at=created_at)
+                for i in range(2)
+            ])
+            
+            session.execute(
+                update(TaskModel)
+                .where(TaskModel.id == str(tasks[0].id))
+                .values(status=TaskStatusEnum.COMPLETED, updated_at=datetime(2026, 1, 2, 12, 0, 0))
+            )
+            session.commit()
+            
+            stats = storage.get_stats(date(2026, 1, 1))
+            changed_at = session.execute(
+                select(TaskModel.status_changed_at).where(TaskModel.id == str(tasks[0].id))
+            ).scalar_one()
+
+        assert [tuple(day) for day in stats["daily"]] == [
+            (date(2026, 1, 1), 2, 0),
+            (date(2026, 1, 2), 0, 1),
+        ]
+        assert stats["by_status"] == {TaskStatus.CREATED: 1, TaskStatus.COMPLETED: 1}
+        assert stats["durations"] == {TaskStatus.CREATED: (86400.0, 1)}
+        assert changed_at == datetime(2026, 1, 2, 12, 0, 0)
+
+
+class TestSlowQueryLog:
+    """Test cases for the slow-query log."""
+
+    def test_logs_caller_parameters_and_plan(self, migrated_engine, caplog):
+        """Test that a statement over the threshold is logged with its plan."""
+        log_slow_queries(migrated_engine, threshold_ms=0)
+        
+        with caplog.at_level("WARNING", logger="app.database.slow_queries"):
+            with Session(migrated_engine) as session:
+                TaskStorage(session).get_tasks(status=TaskStatus.COMPLETED, include_total=False)
+        
+        [record] = caplog.records
+        message = record.getMessage()
+        assert "in TaskStorage.get_tasks" in message
+        assert "('COMPLETED', 10, 0)" in message
+        assert "SEARCH tasks USING INDEX ix_tasks_status_created_at_id" in message
+
+    def test_fast_queries_are_not_logged(self, migrated_engine, caplog):
+        """Test that statements under the threshold are not logged."""
+        log_slow_queries(migrated_engine, threshold_ms=60000)
+        
+        with caplog.at_level("WARNING", logger="app.database.slow_queries"):
+            with Session(migrated_engine) as session:
+                TaskStorage(session).count()
+        
+        assert caplog.records == []
+
+
+class TestSQLiteProfile:
+    """Test cases for the SQLite connection profile."""
+
+    def test_pragmas_applied_on_connect(self):
+        """Test that new connections get the configured pragmas."""
+        with engine.connect() as connection:
+            assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+            assert connection.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+            assert connection.exec_driver_sql("PRAGMA temp_store").scalar() == 2  # MEMORY
+
+    def test_read_engine_is_query_only(self):
+        """Test that the read pool refuses writes."""
+        with read_engine.connect() as connection:
+            assert connection.exec_driver_sql("PRAGMA query_only").scalar() == 1
+            with pytest.raises(OperationalError):
+                connection.exec_driver_sql("DELETE FROM tasks WHERE id = 'missing'")
+
+
+class TestWriteBatcher:
+    """Test cases for the group-commit write batcher."""
+
+    @pytest.fixture
+    def batcher(self):
+        """Create a batcher with a window wide enough to collect a burst."""
+        batcher = WriteBatcher(max_batch_size=64, max_wait_ms=50)
+        yield batcher
+        batcher.close()
+
+    def test_concurrent_writes_share_commits(self, batcher):
+        """Test that a burst of creates is committed in fewer transactions."""
+        tasks = [Task(title=f"Task {i}", description="Batched task") for i in range(20)]
+        
+        with ThreadPoolExecutor(max_workers=20) as executor:
+            futures = list(executor.map(lambda task: batcher.submit("create_task", task), tasks))
+            created = [future.result() for future in futures]
+        
+        assert [task.id for task in created] == [task.id for task in tasks]
+        assert batcher.writes == 20
+        assert batcher.commits < 20
+        for task in tasks:
+            assert TaskStorage().get_task(task.id) is not None
+
+    def test_failing_write_only_fails_its_caller(self, batcher):
+        """Test that one bad write does not fail the rest of its batch."""
+        existing = TaskStorage().create_task(Task(title="Existing", description="Existing task"))
+        fresh = Task(title="Fresh", description="Fresh task")
+        
+        duplicate = batcher.submit("create_task", existing)
+        created = batcher.submit("create_task", fresh)
+        updated = batcher.submit("update_task", existing.id, {"title": "Renamed"})
+        
+        with pytest.raises(IntegrityError):
+            duplicate.result()
+        assert created.result().id == fresh.id
+        assert updated.result().title == "Renamed"
+
+    def test_cancelled_write_is_dropped_from_its_batch(self, batcher):
+        """Test that a caller giving up neither runs its write nor stalls the others."""
+        cancelled_task = Task(title="Cancelled", description="Never written")
+        kept_task = Task(title="Kept", description="Written")
+        
+        cancelled = batcher.submit("create_task", cancelled_task)
+        kept = batcher.submit("create_task", kept_task)
+        assert cancelled.cancel()
+        
+        assert kept.result(timeout=5).id == kept_task.id
+        later = batcher.submit("create_task", Task(title="Later", description="Written"))
+        assert later.result(timeout=5).title == "Later"
+        assert TaskStorage().get_task(cancelled_task.id) is None
+
+
+class TestInMemoryTaskStorage:
+    """Test cases for the in-memory storage backend."""
+
+    def test_pages_match_list_order(self):
+        """Test status filter, offset and cursor against the newest-first order."""
+        storage = InMemoryTaskStorage()
+        created_at = datetime(2026, 1, 1, 12, 0, 0)
+        tasks = storage.create_tasks([
+            Task(
+                title=f"Task {i}",
+                description="",
+                status=TaskStatus.COMPLETED if i % 2 else TaskStatus.CREATED,
+                created_at=created_at.replace(minute=i // 2)
+            )
+            for i in range(10)
+        ])
+        newest_first = sorted(tasks, key=lambda task: (task.created_at, str(task.id)), reverse=True)
+        completed = [task for task in newest_first if task.status == TaskStatus.COMPLETED]
+        
+        page, total = storage.get_tasks(skip=2, limit=3)
+        assert [task.id for task in page] == [task.id for task in newest_first[2:5]]
+        assert total == 10
+        
+        page, total = storage.get_tasks(status=TaskStatus.COMPLETED, limit=2)
+        assert [task.id for task in page] == [task.id for task in completed[:2]]
+        assert total == 5
+        
+        cursor = (completed[1].created_at, completed[1].id)
+        page, _ = storage.get_tasks(status=TaskStatus.COMPLETED, after=cursor)
+        assert [task.id for task in page] == [task.id for task in completed[2:]]
+        
+        rows, _ = storage.get_task_rows(["id", "title"], limit=1, include_total=False)
+        assert rows == [{"id": str(newest_first[0].id), "title": newest_first[0].title}]
+
+    def test_rollups_follow_status_changes(self):
+        """Test counts, daily stats and time in status kept without triggers."""
+        storage = InMemoryTaskStorage()
+        task = storage.create_task(Task(title="Task", description=""))
+        
+        assert storage.update_tasks_status(TaskStatus.COMPLETED, ids=[task.id]) == 1
+        assert storage.update_tasks_status(TaskStatus.COMPLETED, ids=[task.id]) == 0
+        stats = storage.get_stats(date.today())
+        
+        assert stats["by_status"][TaskStatus.COMPLETED] == 1
+        assert stats["by_status"][TaskStatus.CREATED] == 0
+        assert [day[1:] for day in stats["daily"]] == [(1, 1)]
+        assert stats["durations"][TaskStatus.CREATED][1] == 1
+
+    def test_transaction_rolls_back_on_error(self):
+        """Test that a failing block leaves no writes behind."""
+        storage = InMemoryTaskStorage()
+        existing = storage.create_task(Task(title="Existing", description=""))
+        
+        with pytest.raises(ValueError):
+            storage.create_tasks([Task(title="Fresh", description=""), existing])
+        
+        assert storage.count() == 1
+        assert storage.get_tasks(status=TaskStatus.CREATED)[1] == 1
+        assert [day[1:] for day in storage.get_stats(date.today())["daily"]] == [(1, 0)]
+
+    def test_snapshot_round_trip(self, tmp_path):
+        """Test that a snapshot restores tasks, indexes and rollups."""
+        path = str(tmp_path / "tasks.json")
+        storage = InMemoryTaskStorage(path)
+        task = storage.create_task(Task(title="Найти отчет", description="Квартальный"))
+        storage.update_task(task.id, {"status": TaskStatus.IN_PROGRESS})
+        storage.close()
+        
+        restored = InMemoryTaskStorage(path)
+        
+        assert restored.get_task(task.id) == storage.get_task(task.id)
+        assert restored.get_tasks(status=TaskStatus.IN_PROGRESS)[1] == 1
+        assert restored.search_tasks("отч")[1] == 1
+        assert restored.get_stats(date.today()) == storage.get_stats(date.today())
@@ -1,11 +1,20 @@
 """Service layer tests."""
 
+import json
+
 import pytest
 from uuid import uuid4
 
+from app.database.async_storage import AsyncTaskStorage, ThreadpoolTaskStorage
+from app.database.memory_storage import InMemoryTaskStorage
+from app.database.storage import TaskStorage
 from app.models.task import Task, TaskStatus
-from app.schemas.task_schemas import TaskCreate, TaskUpdate
-from app.services.task_service import TaskService
+from app.schemas.task_schemas import TaskCreate, TaskStatusBulkUpdate, TaskUpdate
+from app.services.cache import TTLCache, task_cache, task_list_cache
+from app.services.export import ExportFormat
+from app.services.importer import IMPORT_MAX_LINE_BYTES, NdjsonTaskReader
+from app.services.pagination import encode_cursor
+from app.services.task_service import AsyncTaskService, TaskService
 
 
 class TestTaskService:
@@ -42,6 +51,44 @@ class TestTaskService:
         
         assert task.status == TaskStatus.CREATED
 
+    def test_create_tasks(self, task_service):
+        """Test creating several tasks at once."""
+        tasks_data = [
+            TaskCreate(title="Task 1", description="First task", status=TaskStatus.IN_PROGRESS),
+            TaskCreate(title="Task 2", description="Second task"),
+        ]
+        
+        tasks = task_service.create_tasks(tasks_data)
+        
+        assert [task.title for task in tasks] == ["Task 1", "Task 2"]
+        assert tasks[1].status == TaskStatus.CREATED
+        for task in tasks:
+            assert task_service.get_task(task.id) == task
+
+    def test_transaction_commits_once(self, task_service):
+        """Test that writes inside a transaction are committed together."""
+        with task_service.storage.transaction() as storage:
+            first = TaskService(storage).create_task(
+                TaskCreate(title="Task 1", description="First task")
+            )
+            second = TaskService(storage).create_task(
+                TaskCreate(title="Task 2", description="Second task")
+            )
+        
+        assert task_service.get_task(first.id) is not None
+        assert task_service.get_task(second.id) is not None
+
+    def test_transaction_rolls_back_on_error(self, task_service):
+        """Test that a failing transaction leaves no writes behind."""
+        with pytest.raises(RuntimeError):
+            with task_service.storage.transaction() as storage:
+                task = TaskService(storage).create_task(
+                    TaskCreate(title="Task 1", description="First task")
+                )
+                raise RuntimeError("abort")
+        
+        assert task_service.get_task(task.id) is None
+
     def test_get_task(self, task_service):
         """Test getting a task by ID."""
         # First create a task
@@ -130,6 +177,29 @@ class TestTaskService:
         # Check that we have at least 15 tasks total
         assert total >= 15
 
+    def test_get_tasks_with_cursor(self, task_service):
+        """Test getting tasks after a cursor position."""
+        for i in range(5):
+            task_data = TaskCreate(
+                title=f"Task {i+1}",
+                description=f"Task {i+1} description",
+                status=TaskStatus.CREATED
+            )
+            task_service.create_task(task_data)
+        
+        first_page, _ = task_service.get_tasks(limit=2)
+        cursor = encode_cursor(first_page[-1])
+        
+        next_page, _ = task_service.get_tasks(limit=2, cursor=cursor)
+        offset_page, _ = task_service.get_tasks(skip=2, limit=2)
+        
+        assert [task.id for task in next_page] == [task.id for task in offset_page]
+
+    def test_get_tasks_with_invalid_cursor(self, task_service):
+        """Test getting tasks with a malformed cursor."""
+        with pytest.raises(ValueError):
+            task_service.get_tasks(cursor="not-a-cursor")
+
     def test_update_task(self, task_service):
         """Test updating a task."""
         # First create a task
@@ -174,6 +244,23 @@ class TestTaskService:
         assert updated_task.description == created_task.description  # Unchanged
         assert updated_task.status == created_task.status  # Unchanged
 
+    def test_update_task_ignores_nulls(self, task_service):
+        """Test that explicit nulls keep the stored values."""
+        task_data = TaskCreate(
+            title="Original Task",
+            description="Original description",
+            status=TaskStatus.CREATED
+        )
+        created_task = task_service.create_task(task_data)
+        
+        update_data = TaskUpdate(title=None, status=TaskStatus.COMPLETED)
+        
+        updated_task = task_service.update_task(created_task.id, update_data)
+        
+        assert updated_task.title == created_task.title
+        assert updated_task.status == TaskStatus.COMPLETED
+        assert updated_task.updated_at > created_task.updated_at
+
     def test_update_task_not_found(self, task_service):
         """Test updating a non-existent task."""
         fake_id = uuid4()
@@ -183,6 +270,22 @@ class TestTaskService:
         
         assert updated_task is None
 
+    def test_update_tasks_status(self, task_service):
+        """Test moving many tasks to a new status."""
+        tasks = task_service.create_tasks([
+            TaskCreate(title="Task 1", description="First task", status=TaskStatus.CREATED),
+            TaskCreate(title="Task 2", description="Second task", status=TaskStatus.COMPLETED),
+        ])
+        
+        updated = task_service.update_tasks_status(
+            TaskStatusBulkUpdate(status=TaskStatus.COMPLETED, ids=[task.id for task in tasks])
+        )
+        
+        # The task that was already completed is not counted
+        assert updated == 1
+        for task in tasks:
+            assert task_service.get_task(task.id).status == TaskStatus.COMPLETED
+
     def test_delete_task(self, task_service):
         """Test deleting a task."""
         # First create a task
@@ -225,3 +328,222 @@ class TestTaskService:
         # Check non-existent task
         fake_id = uuid4()
         assert task_service.task_exists(fake_id) is False
+
+    def test_import_then_export(self, task_service):
+        """Test that the streaming import and export also run synchronously."""
+        marker = uuid4().hex
+        result = task_service.import_tasks([
+            f'{{"title": "{marker}", "descr'.encode(),
+            b'iption": "Imported"}\nnot json\n',
+        ])
+        
+        assert result.imported == 1
+        assert result.failed == 1
+        
+        lines = "".join(task_service.export_tasks(ExportFormat.NDJSON)).splitlines()
+        assert json.loads(lines[-1])["title"] == marker
+
+
+class TestAsyncTaskService:
+    """Test cases for AsyncTaskService over every storage backend."""
+
+    @pytest.fixture(params=["async", "threadpool", "memory"])
+    def async_task_service(self, request):
+        """Create an async task service over each storage backend."""
+        if request.param == "async":
+            return AsyncTaskService(AsyncTaskStorage())
+        if request.param == "memory":
+            return AsyncTaskService(ThreadpoolTaskStorage(InMemoryTaskStorage()))
+        return AsyncTaskService(ThreadpoolTaskStorage(TaskStorage()))
+
+    @pytest.mark.asyncio
+    async def test_task_lifecycle(self, async_task_service):
+        """Test creating, reading, updating and deleting a task."""
+        created_task = await async_task_service.create_task(
+            TaskCreate(title="Test Task", description="Test description")
+        )
+        
+        retrieved_task = await async_task_service.get_task(created_task.id)
+        assert retrieved_task == created_task
+        
+        updated_task = await async_task_service.update_task(
+            created_task.id, TaskUpdate(status=TaskStatus.IN_PROGRESS)
+        )
+        assert updated_task.status == TaskStatus.IN_PROGRESS
+        assert updated_task.title == created_task.title
+        
+        assert await async_task_service.delete_task(created_task.id) is True
+        assert await async_task_service.task_exists(created_task.id) is False
+
+    @pytest.mark.asyncio
+    async def test_get_tasks_with_filtering(self, async_task_service):
+        """Test listing tasks filtered by status."""
+        await async_task_service.create_tasks([
+            TaskCreate(title="Task 1", description="First task", status=TaskStatus.COMPLETED),
+            TaskCreate(title="Task 2", description="Second task", status=TaskStatus.CREATED),
+        ])
+        
+        tasks, total = await async_task_service.get_tasks(status=TaskStatus.COMPLETED)
+        
+        assert len(tasks) >= 1
+        assert total >= 1
+        for task in tasks:
+            assert task.status == TaskStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_search_tasks(self, async_task_service):
+        """Test full-text search through each storage backend."""
+        marker = uuid4().hex
+        created_task = await async_task_service.create_task(
+            TaskCreate(title=f"Найти {marker}", description="Поиск по названию")
+        )
+        
+        tasks, total = await async_task_service.search_tasks(marker)
+        
+        assert total == 1
+        assert tasks[0].id == created_task.id
+
+    @pytest.mark.asyncio
+    async def test_export_tasks(self, async_task_service):
+        """Test streaming an export through each storage backend."""
+        created_tasks = await async_task_service.create_tasks([
+            TaskCreate(title="Task 1", description="Exported", status=TaskStatus.IN_PROGRESS),
+            TaskCreate(title="Task 2", description="Exported", status=TaskStatus.IN_PROGRESS),
+        ])
+        
+        chunks = async_task_service.export_tasks(
+            ExportFormat.NDJSON,
+            status=TaskStatus.IN_PROGRESS,
+            created_after=created_tasks[0].created_at
+        )
+        lines = "".join([chunk async for chunk in chunks]).splitlines()
+        
+        assert [json.loads(line)["id"] for line in lines[-2:]] == [
+            str(task.id) for task in created_tasks
+        ]
+
+
+class TestNdjsonTaskReader:
+    """Test cases for the incremental NDJSON import reader."""
+
+    def test_lines_split_across_pieces(self):
+        """Test that lines are validated once complete, whatever the piece sizes."""
+        reader = NdjsonTaskReader()
+        
+        items = list(reader.feed(b'{"title": "A", "descr'))
+        items += reader.feed(b'iption": "x"}\n\n{"title": "B", "description": "y"}')
+        items += reader.close()
+        
+        assert [line for line, _ in items] == [1, 3]
+        assert [item.title for _, item in items] == ["A", "B"]
+
+    def test_rejects_overlong_line_without_buffering_it(self):
+        """Test that an overlong line becomes an error and the next line still parses."""
+        reader = NdjsonTaskReader()
+        
+        items = list(reader.feed(b"x" * (IMPORT_MAX_LINE_BYTES + 1)))
+        items += reader.feed(b"x" * 10 + b'\n{"title": "A", "description": "x"}\n')
+        
+        assert items[0][0] == 1
+        assert "longer than" in items[0][1]
+        assert items[1][1].title == "A"
+
+
+class TestTaskCache:
+    """Test cases for the read-through task cache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that a full cache drops the entry used longest ago."""
+        cache = TTLCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_entries_expire(self):
+        """Test that entries older than the TTL are misses."""
+        cache = TTLCache(max_size=10, ttl=0)
+        cache.set("a", 1)
+        
+        assert cache.get("a") is None
+        assert cache.stats()["size"] == 0
+
+    def test_zero_size_disables_cache(self):
+        """Test that a cache without room stores nothing."""
+        cache = TTLCache(max_size=0, ttl=60)
+        cache.set("a", 1)
+        
+        assert cache.get("a") is None
+
+    def test_get_task_is_served_from_cache(self):
+        """Test that repeated reads skip storage until the task is written."""
+        task_service = TaskService(TaskStorage())
+        created_task = task_service.create_task(
+            TaskCreate(title="Cached Task", description="Cached description")
+        )
+        task_service.get_task(created_task.id)
+        hits = task_cache.hits
+        
+        # Written behind the service's back: the cached copy is still served
+        TaskStorage().update_task(created_task.id, {"title": "Changed in storage"})
+        assert task_service.get_task(created_task.id).title == "Cached Task"
+        assert task_cache.hits == hits + 1
+        
+        updated_task = task_service.update_task(created_task.id, TaskUpdate(description="New"))
+        assert updated_task.title == "Changed in storage"
+        assert task_service.get_task(created_task.id) == updated_task
+
+    def test_read_racing_a_write_is_not_cached(self):
+        """Test that a task read before a concurrent update is not cached after it."""
+        task_service = TaskService(TaskStorage())
+        created_task = task_service.create_task(
+            TaskCreate(title="Cached Task", description="Cached description")
+        )
+        
+        class RacingStorage(TaskStorage):
+            def get_task(self, task_id):
+                task = super().get_task(task_id)
+                # Committed and invalidated after the read, before the cache fill
+                task_service.update_task(task_id, TaskUpdate(title="Updated"))
+                return task
+        
+        stale_task = TaskService(RacingStorage()).get_task(created_task.id)
+        
+        assert stale_task.title == "Cached Task"
+        assert task_cache.get(created_task.id) is None
+        assert task_service.get_task(created_task.id).title == "Updated"
+
+    def test_writes_invalidate_cached_tasks(self):
+        """Test that bulk status updates and deletes drop cached tasks."""
+        task_service = TaskService()
+        created_task = task_service.create_task(
+            TaskCreate(title="Cached Task", description="Cached description")
+        )
+        task_service.get_task(created_task.id)
+        
+        task_service.update_tasks_status(
+            TaskStatusBulkUpdate(status=TaskStatus.COMPLETED, ids=[created_task.id])
+        )
+        assert task_service.get_task(created_task.id).status == TaskStatus.COMPLETED
+        
+        task_service.delete_task(created_task.id)
+        assert task_service.get_task(created_task.id) is None
+
+    def test_list_pages_cached_until_next_write(self):
+        """Test that a list page is reused until a write bumps the version."""
+        task_service = TaskService()
+        task_service.create_task(TaskCreate(title="Listed Task", description="Listed"))
+        first_page = task_service.get_tasks(limit=5)
+        hits = task_list_cache.hits
+        
+        assert task_service.get_tasks(limit=5) is first_page
+        assert task_list_cache.hits == hits + 1
+        
+        created_task = task_service.create_task(TaskCreate(title="New Task", description="New"))
+        tasks, _ = task_service.get_tasks(limit=5)
+        assert tasks[0].id == created_task.id